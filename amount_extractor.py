@@ -0,0 +1,162 @@
+"""
+금액 / 비율 추출
+"금 5,000,000원", "500만원", "1억 2천만 원", "오백만원", "30%" 같은 표현을 찾아
+정수(원) / 수(%)로 바꾼다. 금액 표현은 줄을 넘지 않으므로 줄 단위로 나눠 읽어도 결과가 같다.
+규칙 평가에는 키워드 앞뒤 같은 줄의 금액만 쓰므로 본문 전체가 아니라 그 구간만 읽는다
+"""
+
+import re
+
+# 한글 숫자
+_DIGITS = {"영": 0, "공": 0, "일": 1, "이": 2, "삼": 3, "사": 4, "오": 5, "육": 6, "칠": 7, "팔": 8, "구": 9}
+_SMALL_UNITS = {"십": 10, "백": 100, "천": 1000}
+_BIG_UNITS = {"만": 10 ** 4, "억": 10 ** 8, "조": 10 ** 12}
+
+_NUMERALS = "일이삼사오육칠팔구십백천"
+_UNITS = "만억조"
+
+# 숫자 덩어리: 아라비아 숫자로 시작하거나, 단어 첫머리(또는 "금" 바로 뒤)의 한글 숫자로 시작
+# (한글 숫자는 "금액이 5,000원"의 "이"처럼 조사와 겹치므로 단어 중간에서는 시작하지 않음)
+# 덩어리 안의 띄어쓰기는 숫자/단위 앞에서만 허용하고 줄은 넘지 않는다
+AMOUNT_PATTERN = re.compile(
+    rf"(?:\d|(?:(?<![가-힣])|(?<=금))[{_NUMERALS}])"
+    rf"(?:[\d,.{_NUMERALS}{_UNITS}]|[ \t](?=[\d{_NUMERALS}{_UNITS}]))*"
+    r"[ \t]*(원|%|퍼센트|프로)"
+)
+
+# 금액/비율 뒤에 오는 단위 - 본문에서는 이것만 찾고(str.find), 찾은 곳에서만 앞쪽 숫자 덩어리를 읽음
+# (한글 숫자 글자는 본문에 흔해서 모든 위치에서 정규식을 시도하면 키워드 검색만큼 느림)
+_SUFFIXES = ("원", "%", "퍼센트", "프로")
+_NUMBER_CHARS = frozenset("0123456789,." + _NUMERALS + _UNITS)
+
+# 금액 표현 하나의 최대 길이 (단위 앞쪽으로 이만큼만 거슬러 읽음)
+MAX_EXPRESSION_LENGTH = 40
+
+# 키워드 앞뒤 몇 글자 안의 금액까지 그 키워드의 금액으로 볼지 (같은 줄 안에서만)
+AMOUNT_WINDOW = 80
+
+_TOKEN = re.compile(rf"\d+(?:\.\d+)?|[{''.join(_DIGITS)}]|[{''.join(_SMALL_UNITS)}]|[{_UNITS}]")
+
+
+class Amount:
+    """본문에서 찾은 금액/비율 하나 (start~end는 원문 글자 위치, unit은 "원" / "%")"""
+
+    __slots__ = ("start", "end", "value", "unit", "text")
+
+    def __init__(self, start, end, value, unit, text):
+        self.start = start
+        self.end = end
+        self.value = value
+        self.unit = unit
+        self.text = text
+
+    def shifted(self, offset):
+        return Amount(self.start + offset, self.end + offset, self.value, self.unit, self.text)
+
+    def __repr__(self):
+        return f"Amount({self.text!r}={self.value}{self.unit} @{self.start})"
+
+
+def parse_number(expression):
+    """한글/아라비아 숫자 표현 → 수 ("1억 2천만" → 120000000, "오백만" → 5000000, 읽을 수 없으면 None)"""
+    total = 0       # 만/억/조 단위로 끝난 부분
+    section = 0     # 만 단위 아래 (십/백/천으로 끝난 부분)
+    current = None  # 아직 단위가 붙지 않은 숫자
+    for token in _TOKEN.findall(expression.replace(",", "")):
+        if token in _SMALL_UNITS:
+            section += (1 if current is None else current) * _SMALL_UNITS[token]
+            current = None
+        elif token in _BIG_UNITS:
+            if current is not None:
+                section += current
+            total += (section or 1) * _BIG_UNITS[token]
+            section, current = 0, None
+        elif token in _DIGITS:
+            current = _DIGITS[token] if current is None else current * 10 + _DIGITS[token]
+        else:
+            if current is not None:
+                return None     # "5 3원"처럼 숫자 두 개가 붙어 있음
+            current = float(token) if "." in token else int(token)
+    value = total + section + (current or 0)
+    if value != int(value):
+        return value
+    return int(value)
+
+
+def _suffix_positions(text, start, end):
+    """숫자 바로 뒤(띄어쓰기 허용)에 단위가 오는 곳 [(단위 시작, 단위 끝, 숫자 끝), ...] (위치 순)"""
+    positions = []
+    for suffix in _SUFFIXES:
+        i = text.find(suffix, start, end)
+        while i != -1:
+            j = i
+            while j > start and text[j - 1] in " \t":
+                j -= 1
+            if j > start and text[j - 1] in _NUMBER_CHARS:
+                positions.append((i, i + len(suffix), j))
+            i = text.find(suffix, i + 1, end)
+    positions.sort()
+    return positions
+
+
+def _expression_start(text, start, number_end):
+    """숫자 덩어리가 시작할 수 있는 가장 앞 위치 (숫자/단위 글자, 그 앞의 띄어쓰기 한 칸까지)"""
+    limit = max(start, number_end - MAX_EXPRESSION_LENGTH)
+    k = number_end
+    while k > limit:
+        c = text[k - 1]
+        if c in _NUMBER_CHARS or (c in " \t" and text[k] in _NUMBER_CHARS):
+            k -= 1
+        else:
+            break
+    return k
+
+
+def extract_amounts(text, base=0, start=0, end=None):
+    """text[start:end]의 금액/비율 목록 [Amount, ...] (위치 순, text[0]이 원문의 base 위치)
+
+    본문의 단위 글자("원", "%" ...)만 찾고, 그 앞에 숫자가 있을 때만 숫자 덩어리를 읽는다.
+    """
+    end = len(text) if end is None else end
+    amounts = []
+    last_end = start
+    for suffix_start, suffix_end, number_end in _suffix_positions(text, start, end):
+        if suffix_start < last_end:
+            continue
+        match = None
+        for i in range(max(last_end, _expression_start(text, start, number_end)), number_end):
+            match = AMOUNT_PATTERN.match(text, i, suffix_end)
+            if match is not None and match.end() == suffix_end:
+                break
+            match = None
+        if match is None:
+            continue
+        value = parse_number(text[match.start():match.start(1)])
+        if value is None:
+            continue
+        last_end = suffix_end
+        unit = "원" if match.group(1) == "원" else "%"
+        if unit == "원":
+            value = int(value)
+        amounts.append(Amount(base + match.start(), base + suffix_end, value, unit, match.group()))
+    return amounts
+
+
+def amounts_near(text, spans, base=0):
+    """키워드 위치마다 앞뒤(같은 줄, AMOUNT_WINDOW 글자 안)의 금액 → {(start, end): [Amount, ...]}
+
+    spans: 원문 기준 키워드 위치 [(start, end), ...] (text[0]이 원문의 base 위치)
+    금액이 없는 키워드는 넣지 않는다.
+    """
+    amounts = {}
+    for start, end in spans:
+        local_start, local_end = start - base, end - base
+        line_start = text.rfind("\n", max(0, local_start - AMOUNT_WINDOW), local_start)
+        line_end = text.find("\n", local_end, local_end + AMOUNT_WINDOW)
+        found = extract_amounts(text, base, max(0, local_start - AMOUNT_WINDOW) if line_start == -1 else line_start + 1,
+                                local_start)
+        found += extract_amounts(text, base, local_end,
+                                 min(len(text), local_end + AMOUNT_WINDOW) if line_end == -1 else line_end)
+        if found:
+            amounts[(start, end)] = found
+    return amounts
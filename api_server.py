@@ -0,0 +1,276 @@
+"""
+계약서 분석 HTTP API (Streamlit 없이 다른 시스템에서 호출)
+
+    POST   /analyze                          본문: 계약서 텍스트(text/plain) 또는 PDF(application/pdf)
+    GET    /results/<id>/report              상세 리포트 (?format=txt|md|html|json, 기본 txt)
+    GET    /results/<id>/improvement-request 변호사 개선 요청서 (?format=같음)
+    DELETE /results/<id>                     분석 결과 즉시 삭제
+    GET    /health
+
+분석은 프로세스 풀에서 돌리고, 처리 중 + 대기 중 요청이 상한에 닿으면 바로 503으로 거절한다.
+본문은 저장하지 않고, 분석 결과만 RESULT_EXPIRY_MINUTES 동안 보관한다 (웹 화면과 같음)
+CONGA_SHADOW_PACK에 규칙 팩을 지정하면 같은 매칭 결과로 그 팩도 평가해 판정 차이만 CONGA_SHADOW_LOG에 남긴다
+
+실행: python api_server.py --port 8502
+"""
+
+import argparse
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import parse_qs, urlsplit
+
+from contract_analyzer import analyze_contract
+from contract_result import UnknownRuleset
+from contract_ruleset import find_ruleset, get_ruleset, reload_ruleset
+from contract_shadow import SHADOW_RULE_PACK, compare, record_diff
+from pdf_extractor import extract_pdf
+from report_renderer import FORMATS, ReportCache, content_type
+from result_cache import ResultCache, result_key
+from upload_ingest import MAX_PDF_PAGES, MAX_UPLOAD_BYTES, UploadRejected, ingest
+
+# 결과 자동 소멸 시간 (분) - app.py와 같음
+RESULT_EXPIRY_MINUTES = 5
+
+# 분석 프로세스 수 / 그 외 대기할 수 있는 요청 수
+DEFAULT_WORKERS = os.cpu_count() or 1
+DEFAULT_QUEUE_SIZE = 16
+
+# 경로 → 리포트 문서
+REPORT_DOCUMENTS = {"report": "report", "improvement-request": "request"}
+
+# 요청 하나의 제한 시간 (초)
+REQUEST_TIMEOUT_SECONDS = 60
+
+# 거절할 때 다시 시도해 보라고 알려주는 시간 (초)
+RETRY_AFTER_SECONDS = 1
+
+def _init_worker():
+    # 워커마다 규칙 팩을 미리 읽어 둠 (요청마다 쓸 규칙 세트는 _task_ruleset()에서 고름)
+    get_ruleset()
+    if SHADOW_RULE_PACK:
+        get_ruleset(SHADOW_RULE_PACK)
+
+
+def _task_ruleset(content_hash):
+    """요청을 받은 프로세스가 캐시 키를 만든 규칙 세트 (워커가 아직 예전 팩을 들고 있으면 다시 읽음)"""
+    ruleset = find_ruleset(content_hash) or get_ruleset()
+    if ruleset.content_hash != content_hash:
+        ruleset = reload_ruleset()
+    if ruleset.content_hash != content_hash:
+        # 그 사이 팩이 또 바뀜 - 다른 규칙 세트의 결과를 이 키로 돌려주지 않음
+        raise UnknownRuleset(f"규칙 팩이 바뀌는 중입니다 ({content_hash[:12]})")
+    return ruleset
+
+
+def _analyze_text(ruleset, text):
+    """본문 분석 (섀도 팩이 있으면 같은 매칭으로 함께 평가하고 차이만 기록 - 응답은 기본 팩 결과)"""
+    if not SHADOW_RULE_PACK:
+        return analyze_contract(ruleset, text)
+    results, diffs = compare([ruleset, get_ruleset(SHADOW_RULE_PACK)], text)
+    for diff in diffs:
+        record_diff(diff)
+    return results
+
+
+def _analyze_request(kind, content, content_hash):
+    """워커 프로세스에서 추출 + 분석 (content_hash: 캐시 키를 만든 규칙 세트)"""
+    ruleset = _task_ruleset(content_hash)
+    if kind == "text":
+        return _analyze_text(ruleset, content)
+    document = extract_pdf(content, workers=1, max_pages=MAX_PDF_PAGES)
+    results = _analyze_text(ruleset, document.text)
+    results.pages = document.page_ranges()
+    if document.truncated:
+        results.partial = {"reason": "page_limit", "done": len(document.pages), "total": document.total_pages}
+    return results
+
+
+class Saturated(Exception):
+    """처리 중 + 대기 중 요청이 상한에 닿음"""
+
+
+class AnalysisPool:
+    """크기가 정해진 작업 큐를 가진 분석 프로세스 풀
+
+    submit()은 자리가 없으면 기다리지 않고 Saturated를 낸다 (호출한 쪽에서 바로 503).
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, queue_size=DEFAULT_QUEUE_SIZE):
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+        self._slots = threading.BoundedSemaphore(self.capacity)
+
+    def submit(self, kind, content, content_hash):
+        if not self._slots.acquire(blocking=False):
+            raise Saturated()
+        try:
+            future = self._executor.submit(_analyze_request, kind, content, content_hash)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+class _PdfBody(BytesIO):
+    """요청 본문을 ingest()에 넘기기 위한 업로드 파일 흉내"""
+    type = "application/pdf"
+    name = "request.pdf"
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    server_version = "ConGa"
+    protocol_version = "HTTP/1.1"
+
+    # 서버 객체에 붙여 둔 공유 상태
+    @property
+    def pool(self):
+        return self.server.pool
+
+    @property
+    def results(self):
+        return self.server.results
+
+    @property
+    def reports(self):
+        return self.server.reports
+
+    def log_message(self, format, *args):
+        # 요청 경로에 결과 ID가 들어가므로 기본 접근 로그는 남기지 않음
+        pass
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        parts = url.path.strip("/").split("/")
+        if parts == ["health"]:
+            return self._send_json(200, {"status": "ok", "ruleset": get_ruleset().label})
+        if len(parts) == 3 and parts[0] == "results" and parts[2] in REPORT_DOCUMENTS:
+            fmt = parse_qs(url.query).get("format", ["txt"])[0]
+            if fmt not in FORMATS:
+                return self._send_json(400, {"error": f"format은 {', '.join(FORMATS)} 중 하나입니다"})
+            results = self.results.get(parts[1])
+            if results is None:
+                return self._send_json(404, {"error": "결과가 없거나 만료되었습니다"})
+            # 결과 ID별로 처음 요청한 형식만 만들고 이후에는 만들어 둔 것을 그대로 보냄
+            report = self.reports.get(results, REPORT_DOCUMENTS[parts[2]], fmt, key=parts[1])
+            return self._send(200, report.encode("utf-8"), content_type(fmt))
+        self._send_json(404, {"error": "없는 경로입니다"})
+
+    def do_DELETE(self):
+        parts = self.path.strip("/").split("/")
+        if len(parts) == 2 and parts[0] == "results":
+            self.results.discard(parts[1])
+            self.reports.discard(parts[1])
+            return self._send_json(200, {"deleted": parts[1]})
+        self._send_json(404, {"error": "없는 경로입니다"})
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/analyze":
+            return self._send_json(404, {"error": "없는 경로입니다"})
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_UPLOAD_BYTES:
+            self.close_connection = True
+            return self._send_json(413, {"error": f"본문이 너무 큽니다 (최대 {MAX_UPLOAD_BYTES // 1024 // 1024}MB)"})
+        body = self.rfile.read(length)
+
+        content_type = (self.headers.get("Content-Type") or "text/plain").split(";")[0].strip()
+        try:
+            if content_type == "application/pdf":
+                kind = "pdf"
+                upload = ingest(_PdfBody(body))
+                upload.release()
+                content = body
+            elif content_type == "text/plain":
+                kind = "text"
+                content = body.decode("utf-8")
+            else:
+                return self._send_json(415, {"error": "text/plain 또는 application/pdf만 받습니다"})
+        except (UploadRejected, UnicodeDecodeError) as e:
+            return self._send_json(400, {"error": str(e)})
+
+        ruleset = get_ruleset()
+        key = result_key(content, ruleset)
+        results = self.results.get(key)
+        if results is None:
+            try:
+                future = self.pool.submit(kind, content, ruleset.content_hash)
+            except Saturated:
+                return self._send_json(503, {"error": "요청이 많습니다. 잠시 후 다시 시도해주세요"},
+                                       {"Retry-After": str(RETRY_AFTER_SECONDS)})
+            del content, body
+            try:
+                results = future.result(timeout=REQUEST_TIMEOUT_SECONDS)
+            except FutureTimeout:
+                future.cancel()
+                return self._send_json(504, {"error": "분석 시간이 초과되었습니다"})
+            except Exception as e:
+                return self._send_json(500, {"error": f"분석 중 오류가 발생했습니다: {e}"})
+            if results.partial is None and results.ruleset.content_hash == ruleset.content_hash:
+                self.results.put(key, results)
+
+        self._send_json(200, {
+            "id": key if results.partial is None else None,
+            "expires_in": int(self.results.remaining(key)),
+            "results": results.to_dict(),
+        })
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self._send(status, body, "application/json; charset=utf-8", headers)
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class ApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128    # 접속 대기열 (거절은 분석 큐에서 503으로)
+
+    def __init__(self, address, workers=DEFAULT_WORKERS, queue_size=DEFAULT_QUEUE_SIZE):
+        super().__init__(address, ApiHandler)
+        self.pool = AnalysisPool(workers, queue_size)
+        self.results = ResultCache(ttl_seconds=RESULT_EXPIRY_MINUTES * 60)
+        self.reports = ReportCache(ttl_seconds=RESULT_EXPIRY_MINUTES * 60)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="계약서 분석 HTTP API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="분석 프로세스 수")
+    parser.add_argument("--queue", type=int, default=DEFAULT_QUEUE_SIZE, help="대기할 수 있는 요청 수 (넘으면 503)")
+    args = parser.parse_args(argv)
+
+    server = ApiServer((args.host, args.port), args.workers, args.queue)
+    print(f"계약서 분석 API: http://{args.host}:{args.port} (워커 {args.workers}, 대기 {args.queue})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
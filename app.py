@@ -13,85 +13,48 @@ from datetime import datetime, timedelta
 # 현재 디렉토리를 Python 경로에 추가
 sys.path.insert(0, os.path.dirname(__file__))
 
-from contract_analyzer import ContractAnalyzer
-import PyPDF2
+from contract_analyzer import ContractAnalyzer, describe_spans, specificity_text
+from contract_ruleset import get_ruleset
+from contract_incremental import IncrementalAnalyzer
+from contract_worker import AnalysisJob
+from fee_simulator import DEFAULT_MAX_HOURS, simulate
+from ocr_extractor import OcrUnavailable
+from report_renderer import ReportCache, results_hash
+from report_renderer import content_type as report_content_type
+from report_renderer import file_name as report_file_name
+from result_cache import ResultCache, result_key
+from upload_ingest import UploadRejected, ingest
 from PIL import Image
 import io
 
 # 결과 자동 소멸 시간 (분)
 RESULT_EXPIRY_MINUTES = 5
 
-# 개선 요청서 생성 함수 (사용 전에 정의되어야 함)
-def generate_improvement_request(results):
-    """변호사에게 보낼 개선 요청서 생성"""
+# PDF 추출 상한 (이보다 긴 문서는 앞부분만 분석)
+PDF_MAX_PAGES = 300
 
-    lines = []
-    lines.append("=" * 60)
-    lines.append("계약서 개선 요청서")
-    lines.append("=" * 60)
-    lines.append("")
-    lines.append("변호사님께,")
-    lines.append("")
-    lines.append("계약서를 검토한 결과 다음 사항에 대해 명확히 해주시면 감사하겠습니다:")
-    lines.append("")
+# 요청 하나의 제한 시간 (초) - 지나면 그때까지 읽은 부분만으로 결과를 보여줌
+ANALYSIS_DEADLINE_SECONDS = 60
 
-    # 위험 조항
-    if results['risk_patterns']:
-        lines.append("=" * 60)
-        lines.append("1. 위험 조항 개선 요청")
-        lines.append("=" * 60)
-        lines.append("")
+# 진행 상황 갱신 간격 (초)
+PROGRESS_INTERVAL_SECONDS = 0.25
 
-        for i, risk in enumerate(results['risk_patterns'], 1):
-            lines.append(f"[{i}] {risk['data']['description']}")
-            lines.append(f"    → 개선 요청: {risk['data']['suggestion']}")
-            lines.append("")
+# 다운로드 리포트 형식
+REPORT_FORMAT_LABELS = {"txt": "TXT", "md": "Markdown", "html": "HTML", "json": "JSON"}
 
-    # 구체성 문제
-    if results.get('specificity_issues'):
-        lines.append("=" * 60)
-        lines.append("2. 구체성 개선 요청")
-        lines.append("=" * 60)
-        lines.append("")
-
-        for i, issue in enumerate(results['specificity_issues'], 1):
-            lines.append(f"[{i}] {issue['clause']}")
-            lines.append(f"    → {issue['info']['suggestion']}")
-            lines.append("")
-
-    # 누락 조항
-    missing_required = [name for name, info in results['required_check'].items()
-                       if not info['found'] and info['data']['importance'] == '필수']
-
-    if missing_required:
-        lines.append("=" * 60)
-        lines.append("3. 누락된 필수 조항")
-        lines.append("=" * 60)
-        lines.append("")
-
-        for clause_name in missing_required:
-            lines.append(f"- {clause_name}: {results['required_check'][clause_name]['data']['description']}")
-        lines.append("")
+# 분석기 (규칙 세트는 프로세스 전체가 공유, 규칙 팩 파일이 바뀌면 새 규칙 세트로 자동 교체)
+def get_analyzer():
+    return ContractAnalyzer(get_ruleset())
 
-    # Double Check 질문
-    lines.append("=" * 60)
-    lines.append("4. 추가 확인 질문")
-    lines.append("=" * 60)
-    lines.append("")
-    lines.append("□ 가압류/가처분도 위임 범위에 포함되나요?")
-    lines.append("□ 시간당 차지 금액이 얼마인가요?")
-    lines.append("□ 화해로 끝나도 성과보수를 내야 하나요?")
-    lines.append("□ 일부 승소 시 비율 계산은 어떻게 하나요?")
-    lines.append("□ 계약 해지 시 환불 금액은 어떻게 계산하나요?")
-    lines.append("")
-    lines.append("=" * 60)
-    lines.append("")
-    lines.append("위 사항들에 대해 명확한 답변 부탁드립니다.")
-    lines.append("감사합니다.")
-    lines.append("")
-    lines.append("의뢰인 올림")
-
-    return "\n".join(lines)
+# 분석 결과 캐시 (프로세스 전체 공유 - 업로드 내용의 해시와 결과만 보관, 본문은 저장하지 않음)
+@st.cache_resource
+def get_result_cache():
+    return ResultCache(ttl_seconds=RESULT_EXPIRY_MINUTES * 60)
+
+# 다운로드 리포트 보관 (분석 결과 해시별, 결과와 같은 시간 동안만)
+@st.cache_resource
+def get_report_cache():
+    return ReportCache(ttl_seconds=RESULT_EXPIRY_MINUTES * 60)
 
 # 페이지 설정
 st.set_page_config(
@@ -111,7 +74,7 @@ def check_and_clear_expired_results():
     if 'analysis_expiry' in st.session_state:
         if datetime.now() > st.session_state.analysis_expiry:
             # 만료됨 - 모든 분석 데이터 삭제
-            keys_to_delete = ['analysis_results', 'analysis_expiry', 'analyzed_text']
+            keys_to_delete = ['analysis_results', 'analysis_expiry', 'analyzed_text', 'incremental_analyzer', 'analysis_cache_key']
             for key in keys_to_delete:
                 if key in st.session_state:
                     del st.session_state[key]
@@ -126,8 +89,12 @@ def get_remaining_time():
     return 0
 
 def clear_analysis_data():
-    """분석 데이터 즉시 삭제"""
-    keys_to_delete = ['analysis_results', 'analysis_expiry', 'analyzed_text']
+    """분석 데이터 즉시 삭제 (공유 캐시에 남은 같은 결과와 리포트도 함께 삭제)"""
+    if 'analysis_cache_key' in st.session_state:
+        get_result_cache().discard(st.session_state.analysis_cache_key)
+    if 'analysis_results' in st.session_state:
+        get_report_cache().discard(results_hash(st.session_state.analysis_results))
+    keys_to_delete = ['analysis_results', 'analysis_expiry', 'analyzed_text', 'incremental_analyzer', 'analysis_cache_key']
     for key in keys_to_delete:
         if key in st.session_state:
             del st.session_state[key]
@@ -306,302 +273,441 @@ with st.expander("📝 또는 계약서 텍스트를 직접 입력하세요"):
     if st.button("텍스트 분석하기") and text_input:
         uploaded_file = "text_input"  # 플래그
 
-# 분석 실행
-if uploaded_file:
+
+# 결과 화면
+def render_fee_simulator(results):
+    """보수 시뮬레이션 - 계약서에서 읽은 보수 조건으로 시작하고 슬라이더를 움직일 때마다 다시 계산"""
+    st.markdown("### 🧮 실제로 얼마를 내게 될까요?")
+    st.caption("계약서에서 읽은 금액으로 채워 두었습니다. 계약서와 다르거나 비어 있으면 직접 고쳐 보세요.")
+
+    fees = results.fees or {}
+    # 다른 계약서를 분석하면 입력값도 그 계약서 기준으로 새로 채움
+    prefix = f"fee_{results_hash(results)[:12]}_"
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        retainer = st.number_input("착수금 (원)", min_value=0, step=500_000,
+                                   value=fees.get("retainer") or 0, key=prefix + "retainer")
+    with col2:
+        success_rate = st.number_input("성공보수 비율 (%)", min_value=0.0, max_value=100.0, step=1.0,
+                                       value=float(fees.get("success_rate") or 0), key=prefix + "success_rate")
+    with col3:
+        success_amount = st.number_input("성공보수 금액 (원, 비율이 0일 때)", min_value=0, step=500_000,
+                                         value=fees.get("success_amount") or 0, key=prefix + "success_amount")
+    with col4:
+        hourly_rate = st.number_input("시간당 보수 (원)", min_value=0, step=50_000,
+                                      value=fees.get("hourly_rate") or 0, key=prefix + "hourly_rate")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        claim_amount = st.number_input("경제적 이익 (전부 승소 시 받을 금액, 원)", min_value=0, step=10_000_000,
+                                       value=100_000_000, key=prefix + "claim")
+        success_on_settlement = st.checkbox("화해로 끝나도 성공보수를 냄", value=True, key=prefix + "settlement")
+    with col2:
+        win_percent = st.slider("승소(화해) 비율 (%)", 0, 100, 50, key=prefix + "win")
+        total_hours = st.slider("예상 총 투입 시간", 0, DEFAULT_MAX_HOURS, 100, step=5, key=prefix + "hours")
+        progress_percent = st.slider("중도 해지 시점 (사건 진행률 %)", 0, 100, 30, key=prefix + "progress")
+
+    scenarios = simulate(
+        {
+            "retainer": retainer,
+            "success_rate": success_rate or None,
+            "success_amount": success_amount,
+            "hourly_rate": hourly_rate,
+        },
+        claim_amount,
+        success_on_settlement=success_on_settlement,
+    )
+    point = scenarios.at(win_percent / 100, progress_percent / 100, total_hours)
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("판결로 끝나면", f"{point['judgment']:,}원")
+    col2.metric("화해로 끝나면", f"{point['settlement']:,}원")
+    col3.metric(f"진행률 {progress_percent}%에서 해지하면 환불", f"{point['refund']:,}원",
+                help=f"낸 보수 {point['paid_on_termination']:,}원 (착수금에서 시간당 보수 × 투입 시간 공제)")
+
+    judgment, settlement = scenarios.fee_curve(total_hours)
+    refund, paid = scenarios.refund_curve(total_hours)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**승소 비율별 총 보수 (원)**")
+        st.line_chart({"승소 비율 (%)": scenarios.win_ratios * 100, "판결": judgment, "화해": settlement},
+                      x="승소 비율 (%)")
+    with col2:
+        st.markdown(f"**해지 시점별 환불액 (총 {total_hours}시간 기준, 원)**")
+        st.line_chart({"해지 시점 (%)": scenarios.progress * 100, "환불액": refund, "낸 보수": paid},
+                      x="해지 시점 (%)")
+
+    st.caption(f"성공보수는 승소(화해) 금액 비율만큼, 해지 시 투입 시간은 총 투입 시간 × 진행률로 계산했습니다. "
+               f"실제 계산 방식은 계약서와 변호사에게 확인하세요. ({scenarios.count:,}가지 경우 계산)")
+
+
+def render_results(results):
+    """저장된 분석 결과 표시 (추출/분석은 다시 하지 않음)"""
     st.markdown("---")
-    st.markdown("## 🔍 분석 중...")
-    
-    # 프로그레스 바
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-    
+    st.markdown("## 📊 분석 결과")
+
+    # 개인정보 보호 알림 및 카운트다운
+    remaining_seconds = get_remaining_time()
+    remaining_minutes = remaining_seconds // 60
+    remaining_secs = remaining_seconds % 60
+
+    privacy_col1, privacy_col2 = st.columns([3, 1])
+    with privacy_col1:
+        st.info(f"🔒 **개인정보 보호**: 분석 결과는 **{remaining_minutes}분 {remaining_secs}초** 후 자동 삭제됩니다. (새로고침 시 갱신)")
+    with privacy_col2:
+        if st.button("🗑️ 지금 삭제", help="분석 결과를 즉시 삭제합니다"):
+            clear_analysis_data()
+            st.success("✅ 분석 결과가 삭제되었습니다.")
+            st.rerun()
+
+    # 종합 점수
+    score = results.score
+
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric(
+            "종합 점수",
+            f"{score}/100",
+            delta=None
+        )
+
+    with col2:
+        risk_count = len(results.risks)
+        st.metric(
+            "위험 조항",
+            f"{risk_count}개",
+            delta=None
+        )
+
+    with col3:
+        required = results.clauses_of('필수')
+        found_required = sum(1 for clause, _ in required if clause.found)
+        total_required = len(required)
+        st.metric(
+            "필수 조항",
+            f"{found_required}/{total_required}",
+            delta=None
+        )
+
+    with col4:
+        specificity_issues = len(results.specificity_issues)
+        st.metric(
+            "구체성 문제",
+            f"{specificity_issues}개",
+            delta=None
+        )
+
+    # 점수별 메시지
+    if score >= 80:
+        st.markdown("""
+        <div class="success-box">
+            <h3>✅ 우수한 계약서입니다!</h3>
+            <p>필수 조항이 잘 갖춰져 있고, 위험 요소가 적습니다.</p>
+        </div>
+        """, unsafe_allow_html=True)
+    elif score >= 60:
+        st.markdown("""
+        <div class="warning-box">
+            <h3>⚠️ 보통 수준입니다</h3>
+            <p>일부 개선이 필요합니다. 아래 제안사항을 확인하세요.</p>
+        </div>
+        """, unsafe_allow_html=True)
+    else:
+        st.markdown("""
+        <div class="danger-box">
+            <h3>🚨 주의가 필요한 계약서입니다!</h3>
+            <p>여러 문제점이 발견되었습니다. 계약 전에 반드시 개선을 요청하세요.</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.markdown("---")
+
+    # 위험 조항
+    if results.risks:
+        st.markdown("### 🚨 발견된 위험 조항")
+
+        for i, risk in enumerate(results.risks, 1):
+            rule = results.risk_rule(risk.name)
+            level = rule['risk_level']
+
+            if level == "매우높음":
+                emoji = "🔴🔴"
+                color = "#dc3545"
+            elif level == "높음":
+                emoji = "🔴"
+                color = "#ff6b6b"
+            elif level == "중간":
+                emoji = "🟡"
+                color = "#ffc107"
+            else:
+                emoji = "🟢"
+                color = "#28a745"
+
+            with st.expander(f"{emoji} [{i}] {rule['description']}", expanded=(level in ["매우높음", "높음"])):
+                st.markdown(f"**위험도:** `{level}`")
+                if risk.spans:
+                    st.markdown(f"**근거:** {describe_spans(results, risk.spans)}")
+                st.markdown(f"**❗ 왜 위험한가요?**")
+                st.info(rule['why_risky'])
+                st.markdown(f"**💡 어떻게 해야 하나요?**")
+                st.success(rule['suggestion'])
+    else:
+        st.success("✅ 위험한 조항이 발견되지 않았습니다!")
+
+    st.markdown("---")
+
+    # 구체성 문제
+    if results.specificity_issues:
+        st.markdown("### 📝 구체성 문제")
+        st.warning("다음 조항들이 있지만 충분히 구체적이지 않습니다:")
+
+        for i, clause in enumerate(results.specificity_issues, 1):
+            problem, suggestion = specificity_text(clause)
+            with st.expander(f"⚠️ [{i}] {clause.name}"):
+                st.markdown(f"**문제:** {problem}")
+                if clause.specificity_spans:
+                    st.markdown(f"**근거:** {describe_spans(results, clause.specificity_spans)}")
+                st.markdown(f"**💡 제안:** {suggestion}")
+
+    st.markdown("---")
+
+    # 필수 조항 체크
+    with st.expander("📋 필수 조항 상세 체크", expanded=False):
+        st.markdown("### ✅ 필수 조항")
+
+        for clause, rule in results.clauses_of('필수'):
+            if clause.found:
+                st.success(f"✅ **{clause.name}**: {rule['description']}")
+            else:
+                st.error(f"❌ **{clause.name}**: {rule['description']}")
+                st.caption(f"⚠️ 위험: {rule['risk_if_missing']}")
+
+        st.markdown("### 📌 권장 조항")
+
+        for clause, rule in results.clauses_of('권장'):
+            if clause.found:
+                st.success(f"✅ **{clause.name}**: {rule['description']}")
+            else:
+                st.warning(f"⭕ **{clause.name}**: {rule['description']}")
+                st.caption(f"💡 있으면 더 좋아요: {rule['risk_if_missing']}")
+
+    # Double Check 질문
+    st.markdown("---")
+    st.markdown("## 🔄 Double Check!")
+    st.markdown("### 계약서에는 있지만, 의뢰인에게 확인이 필요한 사항들")
+
+    st.markdown("""
+    <div class="info-box">
+    <h4>📌 다음 사항들을 변호사에게 직접 확인하세요:</h4>
+    </div>
+    """, unsafe_allow_html=True)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("""
+        **💰 비용 관련:**
+        - [ ] 가압류/가처분도 위임 범위에 포함되나요?
+        - [ ] 시간당 차지 금액이 얼마인가요? (대형 로펌 기준 70~150만원)
+        - [ ] 추가 비용은 대략 얼마나 예상되나요?
+        """)
+
+    with col2:
+        st.markdown("""
+        **📊 성과 관련:**
+        - [ ] 화해로 끝나도 성과보수를 내야 하나요?
+        - [ ] 일부 승소 시 비율 계산은 어떻게 하나요?
+        - [ ] 방어 성공 기준은 무엇인가요?
+        """)
+
+    st.markdown("""
+    **⚠️ 실무 조언:**
+    > "계약서에는 명시되어 있어도, 의뢰인이 제대로 이해하지 못한 경우가 많습니다.  
+    > 위 내용들을 변호사에게 직접 물어보고, 명확히 이해한 후 계약하세요."
+    """)
+
+    render_fee_simulator(results)
+
+    # 리포트 다운로드
+    st.markdown("---")
+    st.markdown("## 📥 분석 리포트 다운로드")
+
+    # 리포트는 다운로드 버튼을 누를 때 처음 만들고, 같은 결과면 만들어 둔 것을 그대로 사용
+    report_format = st.radio(
+        "형식:",
+        list(REPORT_FORMAT_LABELS),
+        format_func=REPORT_FORMAT_LABELS.get,
+        horizontal=True,
+        key="report_format"
+    )
+    report_cache = get_report_cache()
+
+    col1, col2 = st.columns(2)
+
+    for column, document, label in (
+        (col1, "report", "📄 상세 리포트 다운로드"),
+        (col2, "request", "📝 변호사 개선 요청서 다운로드"),
+    ):
+        with column:
+            st.download_button(
+                label=f"{label} ({REPORT_FORMAT_LABELS[report_format]})",
+                data=lambda document=document: report_cache.get(results, document, report_format),
+                file_name=report_file_name(document, report_format),
+                mime=report_content_type(report_format),
+                on_click="ignore"
+            )
+
+    # 사용 후기
+    st.markdown("---")
+    st.markdown("## 💬 피드백")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("""
+        **이 서비스가 도움이 되셨나요?**
+
+        피드백을 남겨주시면 서비스 개선에 큰 도움이 됩니다.
+        """)
+
+        feedback_rating = st.radio(
+            "만족도:",
+            ["⭐⭐⭐⭐⭐ 매우 만족", "⭐⭐⭐⭐ 만족", "⭐⭐⭐ 보통", "⭐⭐ 불만족", "⭐ 매우 불만족"],
+            horizontal=True
+        )
+
+    with col2:
+        feedback_text = st.text_area(
+            "개선 의견이나 추가로 체크했으면 하는 조항이 있다면 알려주세요:",
+            height=100
+        )
+
+        if st.button("피드백 제출"):
+            st.success("감사합니다! 피드백이 전달되었습니다.")
+            st.balloons()
+
+
+# 이미 분석한 업로드 파일이면 다시 분석하지 않음 (버튼/라디오 클릭으로 스크립트가 다시 실행되는 경우)
+# 텍스트는 "텍스트 분석하기"를 누를 때만 분석
+if uploaded_file and uploaded_file != "text_input":
+    if uploaded_file.file_id == st.session_state.get('analyzed_upload_id'):
+        uploaded_file = None
+    else:
+        st.session_state.analyzed_upload_id = uploaded_file.file_id
+
+def store_results(results, cache_key, lifetime):
+    """분석 결과를 세션에 저장하고 만료 시간 설정 (원본 텍스트는 저장하지 않음 - 개인정보 보호)"""
+    st.session_state.analysis_results = results
+    st.session_state.analysis_expiry = datetime.now() + lifetime
+    st.session_state.analysis_cache_key = cache_key
+    st.session_state.analyzed_text = None
+
+# 분석 시작 (새 업로드나 새 텍스트일 때만 - 추출/분석은 백그라운드 작업에서)
+if uploaded_file:
+    st.session_state.pop('analysis_results', None)
+    previous_job = st.session_state.pop('analysis_job', None)
+    if previous_job is not None:
+        previous_job.cancel()
+    upload = None
+
     try:
-        # 1. 텍스트 추출
-        status_text.text("📄 계약서 내용을 읽고 있습니다...")
-        progress_bar.progress(20)
-        
+        analyzer = get_analyzer()
+
+        # 파일은 크기/쪽수 제한을 먼저 확인하고, 업로드 버퍼를 복사하지 않고 그대로 사용
         if uploaded_file == "text_input":
-            text = text_input
-        elif uploaded_file.type == "application/pdf":
-            # PDF 처리
-            pdf_reader = PyPDF2.PdfReader(uploaded_file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-        else:
-            # 이미지 처리 (OCR)
-            st.warning("⚠️ 이미지 OCR 기능은 아직 구현 중입니다. PDF 파일을 사용해주세요.")
-            text = ""
-        
-        progress_bar.progress(40)
-        
-        if not text or len(text) < 50:
-            st.error("❌ 계약서 내용을 읽을 수 없습니다. PDF 파일이 올바른지 확인해주세요.")
+            upload_content = text_input
         else:
-            # 2. 분석 실행
-            status_text.text("🔍 계약서를 꼼꼼히 분석하고 있습니다...")
-            progress_bar.progress(60)
-            
-            analyzer = ContractAnalyzer()
-            results = analyzer.analyze_contract(text)
+            upload = ingest(uploaded_file)
+            upload_content = upload.buffer
 
-            progress_bar.progress(80)
-            status_text.text("📊 분석 결과를 정리하고 있습니다...")
+        # 같은 내용을 같은 규칙으로 분석한 결과가 남아 있으면 추출/분석 생략 (처음 분석한 시점 기준으로 만료)
+        result_cache = get_result_cache()
+        cache_key = result_key(upload_content, analyzer.ruleset)
+        results = result_cache.get(cache_key)
 
-            # 결과를 세션에 저장하고 만료 시간 설정
-            st.session_state.analysis_results = results
-            st.session_state.analysis_expiry = datetime.now() + timedelta(minutes=RESULT_EXPIRY_MINUTES)
-            st.session_state.analyzed_text = None  # 원본 텍스트는 저장하지 않음 (개인정보 보호)
+        if results is not None:
+            store_results(results, cache_key, timedelta(seconds=result_cache.remaining(cache_key)))
+        else:
+            incremental = None
+            if uploaded_file == "text_input":
+                # 입력창 텍스트는 이전 분석에서 바뀐 조만 다시 훑음
+                incremental = st.session_state.get('incremental_analyzer')
+                if incremental is None or incremental.ruleset is not analyzer.ruleset:
+                    incremental = st.session_state.incremental_analyzer = IncrementalAnalyzer(analyzer.ruleset)
+
+            st.session_state.analysis_job = AnalysisJob(
+                "text" if upload is None else upload.kind,
+                upload_content,
+                ruleset=analyzer.ruleset,
+                deadline_seconds=ANALYSIS_DEADLINE_SECONDS,
+                incremental=incremental,
+                max_pages=PDF_MAX_PAGES,
+                # 작업이 끝나면 업로드 버퍼 참조를 바로 놓음 (세션에는 결과만 남음)
+                on_finish=upload.release if upload is not None else None
+            )
+            st.session_state.analysis_job_key = cache_key
+            upload = None
+
+    except UploadRejected as e:
+        st.error(f"❌ {e}")
+    except Exception as e:
+        st.error(f"❌ 오류가 발생했습니다: {str(e)}")
+        st.info("파일이 손상되었거나 읽을 수 없는 형식일 수 있습니다. 다른 파일을 시도해주세요.")
+    finally:
+        if upload is not None:
+            upload.release()
 
-            # 원본 데이터 즉시 삭제
-            del text
+# 진행 중인 분석 (취소 버튼을 누르면 스크립트가 다시 실행되며 여기서 작업을 멈춤)
+if 'analysis_job' in st.session_state:
+    job = st.session_state.analysis_job
+    st.markdown("---")
+    st.markdown("## 🔍 분석 중...")
 
-            progress_bar.progress(100)
-            status_text.text("✅ 분석 완료!")
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    if st.button("⏹️ 분석 취소", help="지금까지 읽은 부분만으로 결과를 보여줍니다"):
+        job.cancel()
 
-            # 3. 결과 표시
-            st.markdown("---")
-            st.markdown("## 📊 분석 결과")
-
-            # 개인정보 보호 알림 및 카운트다운
-            remaining_seconds = get_remaining_time()
-            remaining_minutes = remaining_seconds // 60
-            remaining_secs = remaining_seconds % 60
-
-            privacy_col1, privacy_col2 = st.columns([3, 1])
-            with privacy_col1:
-                st.info(f"🔒 **개인정보 보호**: 분석 결과는 **{remaining_minutes}분 {remaining_secs}초** 후 자동 삭제됩니다. (새로고침 시 갱신)")
-            with privacy_col2:
-                if st.button("🗑️ 지금 삭제", help="분석 결과를 즉시 삭제합니다"):
-                    clear_analysis_data()
-                    st.success("✅ 분석 결과가 삭제되었습니다.")
-                    st.rerun()
-
-            # 종합 점수
-            score = results['score']
-            
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric(
-                    "종합 점수",
-                    f"{score}/100",
-                    delta=None
-                )
-            
-            with col2:
-                risk_count = len(results['risk_patterns'])
-                st.metric(
-                    "위험 조항",
-                    f"{risk_count}개",
-                    delta=None
-                )
-            
-            with col3:
-                found_required = sum(1 for v in results['required_check'].values() 
-                                    if v['found'] and v['data']['importance'] == '필수')
-                total_required = sum(1 for v in results['required_check'].values() 
-                                    if v['data']['importance'] == '필수')
-                st.metric(
-                    "필수 조항",
-                    f"{found_required}/{total_required}",
-                    delta=None
-                )
-            
-            with col4:
-                specificity_issues = len(results.get('specificity_issues', []))
-                st.metric(
-                    "구체성 문제",
-                    f"{specificity_issues}개",
-                    delta=None
-                )
-            
-            # 점수별 메시지
-            if score >= 80:
-                st.markdown("""
-                <div class="success-box">
-                    <h3>✅ 우수한 계약서입니다!</h3>
-                    <p>필수 조항이 잘 갖춰져 있고, 위험 요소가 적습니다.</p>
-                </div>
-                """, unsafe_allow_html=True)
-            elif score >= 60:
-                st.markdown("""
-                <div class="warning-box">
-                    <h3>⚠️ 보통 수준입니다</h3>
-                    <p>일부 개선이 필요합니다. 아래 제안사항을 확인하세요.</p>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown("""
-                <div class="danger-box">
-                    <h3>🚨 주의가 필요한 계약서입니다!</h3>
-                    <p>여러 문제점이 발견되었습니다. 계약 전에 반드시 개선을 요청하세요.</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            st.markdown("---")
-            
-            # 위험 조항
-            if results['risk_patterns']:
-                st.markdown("### 🚨 발견된 위험 조항")
-                
-                for i, risk in enumerate(results['risk_patterns'], 1):
-                    level = risk['data']['risk_level']
-                    
-                    if level == "매우높음":
-                        emoji = "🔴🔴"
-                        color = "#dc3545"
-                    elif level == "높음":
-                        emoji = "🔴"
-                        color = "#ff6b6b"
-                    elif level == "중간":
-                        emoji = "🟡"
-                        color = "#ffc107"
-                    else:
-                        emoji = "🟢"
-                        color = "#28a745"
-                    
-                    with st.expander(f"{emoji} [{i}] {risk['data']['description']}", expanded=(level in ["매우높음", "높음"])):
-                        st.markdown(f"**위험도:** `{level}`")
-                        st.markdown(f"**❗ 왜 위험한가요?**")
-                        st.info(risk['data']['why_risky'])
-                        st.markdown(f"**💡 어떻게 해야 하나요?**")
-                        st.success(risk['data']['suggestion'])
+    # 쪽/단계별 진행 상황 표시 (작업이 끝나거나, 취소되거나, 제한 시간이 지날 때까지)
+    while not job.wait(PROGRESS_INTERVAL_SECONDS):
+        fraction, message = job.progress()
+        progress_bar.progress(fraction)
+        status_text.text(message)
+
+    del st.session_state.analysis_job
+    cache_key = st.session_state.pop('analysis_job_key', None)
+    try:
+        results = job.result()
+        fraction, message = job.progress()
+        progress_bar.progress(fraction)
+        status_text.text(message)
+
+        partial = results.partial
+        if job.text_length < 50 and not partial:
+            st.error("❌ 계약서 내용을 읽을 수 없습니다. PDF 파일이나 사진이 올바른지 확인해주세요.")
+        else:
+            if partial is None:
+                get_result_cache().put(cache_key, results)
+            elif partial["reason"] == "page_limit":
+                st.warning(f"⚠️ 문서가 길어 전체 {partial['total']}쪽 중 앞 {partial['done']}쪽만 분석합니다.")
             else:
-                st.success("✅ 위험한 조항이 발견되지 않았습니다!")
-            
-            st.markdown("---")
-            
-            # 구체성 문제
-            if results.get('specificity_issues'):
-                st.markdown("### 📝 구체성 문제")
-                st.warning("다음 조항들이 있지만 충분히 구체적이지 않습니다:")
-                
-                for i, issue in enumerate(results['specificity_issues'], 1):
-                    with st.expander(f"⚠️ [{i}] {issue['clause']}"):
-                        st.markdown(f"**문제:** {issue['info']['description']}")
-                        st.markdown(f"**💡 제안:** {issue['info']['suggestion']}")
-            
-            st.markdown("---")
-            
-            # 필수 조항 체크
-            with st.expander("📋 필수 조항 상세 체크", expanded=False):
-                st.markdown("### ✅ 필수 조항")
-                
-                for clause_name, clause_info in results['required_check'].items():
-                    if clause_info['data']['importance'] == '필수':
-                        if clause_info['found']:
-                            st.success(f"✅ **{clause_name}**: {clause_info['data']['description']}")
-                        else:
-                            st.error(f"❌ **{clause_name}**: {clause_info['data']['description']}")
-                            st.caption(f"⚠️ 위험: {clause_info['data']['risk_if_missing']}")
-                
-                st.markdown("### 📌 권장 조항")
-                
-                for clause_name, clause_info in results['required_check'].items():
-                    if clause_info['data']['importance'] == '권장':
-                        if clause_info['found']:
-                            st.success(f"✅ **{clause_name}**: {clause_info['data']['description']}")
-                        else:
-                            st.warning(f"⭕ **{clause_name}**: {clause_info['data']['description']}")
-                            st.caption(f"💡 있으면 더 좋아요: {clause_info['data']['risk_if_missing']}")
-            
-            # Double Check 질문
-            st.markdown("---")
-            st.markdown("## 🔄 Double Check!")
-            st.markdown("### 계약서에는 있지만, 의뢰인에게 확인이 필요한 사항들")
-            
-            st.markdown("""
-            <div class="info-box">
-            <h4>📌 다음 사항들을 변호사에게 직접 확인하세요:</h4>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("""
-                **💰 비용 관련:**
-                - [ ] 가압류/가처분도 위임 범위에 포함되나요?
-                - [ ] 시간당 차지 금액이 얼마인가요? (대형 로펌 기준 70~150만원)
-                - [ ] 추가 비용은 대략 얼마나 예상되나요?
-                """)
-            
-            with col2:
-                st.markdown("""
-                **📊 성과 관련:**
-                - [ ] 화해로 끝나도 성과보수를 내야 하나요?
-                - [ ] 일부 승소 시 비율 계산은 어떻게 하나요?
-                - [ ] 방어 성공 기준은 무엇인가요?
-                """)
-            
-            st.markdown("""
-            **⚠️ 실무 조언:**
-            > "계약서에는 명시되어 있어도, 의뢰인이 제대로 이해하지 못한 경우가 많습니다.  
-            > 위 내용들을 변호사에게 직접 물어보고, 명확히 이해한 후 계약하세요."
-            """)
-            
-            # 리포트 다운로드
-            st.markdown("---")
-            st.markdown("## 📥 분석 리포트 다운로드")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # 텍스트 리포트 생성
-                report_text = analyzer.generate_report(results)
-                
-                st.download_button(
-                    label="📄 상세 리포트 다운로드 (TXT)",
-                    data=report_text,
-                    file_name="contract_analysis_report.txt",
-                    mime="text/plain"
-                )
-            
-            with col2:
-                # 개선 요청서 생성
-                improvement_request = generate_improvement_request(results)
-                
-                st.download_button(
-                    label="📝 변호사 개선 요청서 다운로드 (TXT)",
-                    data=improvement_request,
-                    file_name="improvement_request.txt",
-                    mime="text/plain"
-                )
-            
-            # 사용 후기
-            st.markdown("---")
-            st.markdown("## 💬 피드백")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("""
-                **이 서비스가 도움이 되셨나요?**
-                
-                피드백을 남겨주시면 서비스 개선에 큰 도움이 됩니다.
-                """)
-                
-                feedback_rating = st.radio(
-                    "만족도:",
-                    ["⭐⭐⭐⭐⭐ 매우 만족", "⭐⭐⭐⭐ 만족", "⭐⭐⭐ 보통", "⭐⭐ 불만족", "⭐ 매우 불만족"],
-                    horizontal=True
-                )
-            
-            with col2:
-                feedback_text = st.text_area(
-                    "개선 의견이나 추가로 체크했으면 하는 조항이 있다면 알려주세요:",
-                    height=100
-                )
-                
-                if st.button("피드백 제출"):
-                    st.success("감사합니다! 피드백이 전달되었습니다.")
-                    st.balloons()
-    
+                reason = "분석을 취소해서" if partial["reason"] == "cancelled" else "제한 시간이 지나서"
+                st.warning(f"⚠️ {reason} 앞부분({partial['done']}/{partial['total'] or '?'})만 분석한 결과입니다.")
+            store_results(results, cache_key, timedelta(minutes=RESULT_EXPIRY_MINUTES))
+            status_text.text("✅ 분석 완료!")
+    except OcrUnavailable as e:
+        st.warning(f"⚠️ 이 서버에서는 사진 인식을 사용할 수 없습니다 ({e}). PDF 파일이나 텍스트 입력을 사용해주세요.")
     except Exception as e:
         st.error(f"❌ 오류가 발생했습니다: {str(e)}")
         st.info("파일이 손상되었거나 읽을 수 없는 형식일 수 있습니다. 다른 파일을 시도해주세요.")
 
+# 결과 표시 (새로 분석했거나, 버튼/라디오 클릭으로 다시 실행될 때는 저장된 결과만 그림)
+if 'analysis_results' in st.session_state:
+    render_results(st.session_state.analysis_results)
+
 # 푸터
 st.markdown("---")
 st.markdown("""
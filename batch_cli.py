@@ -0,0 +1,188 @@
+"""
+계약서 일괄 분석 (명령줄)
+폴더나 압축 파일(zip / tar) 안의 PDF·TXT 계약서를 여러 프로세스로 분석해
+계약서마다 JSON 한 줄씩 출력한다. 끝난 파일은 내용 해시를 매니페스트에 적어 두므로
+중간에 멈춘 작업을 다시 실행하면 남은 파일만 분석한다
+
+실행:
+    python batch_cli.py 계약서폴더/ -o results.jsonl
+    python batch_cli.py contracts.zip -o results.jsonl --workers 8
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tarfile
+import time
+import zipfile
+
+from contract_batch import analyze_documents
+
+SUFFIXES = {".pdf": "pdf", ".txt": "txt"}
+
+# 결과 한 줄에 넣는 근거 위치 수 상한 (항목별)
+MAX_SPANS = 20
+
+
+def _kind_of(name):
+    return SUFFIXES.get(os.path.splitext(name)[1].lower())
+
+
+def iter_files(paths):
+    """(이름, 종류, 내용 bytes)를 하나씩 생성 (폴더는 하위까지, 압축 파일은 안의 파일들)"""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for filename in sorted(files):
+                    yield from iter_files([os.path.join(root, filename)])
+        elif zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path) as archive:
+                for info in archive.infolist():
+                    kind = _kind_of(info.filename)
+                    if kind and not info.is_dir():
+                        yield f"{path}!{info.filename}", kind, archive.read(info)
+        elif tarfile.is_tarfile(path):
+            with tarfile.open(path) as archive:
+                for member in archive:
+                    kind = _kind_of(member.name)
+                    if kind and member.isfile():
+                        yield f"{path}!{member.name}", kind, archive.extractfile(member).read()
+        else:
+            kind = _kind_of(path)
+            if kind:
+                with open(path, "rb") as f:
+                    yield path, kind, f.read()
+
+
+class Manifest:
+    """끝난 파일의 내용 해시 목록 (한 줄에 "해시<TAB>파일 이름", 추가만 함)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.done = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    digest, _, name = line.rstrip("\n").partition("\t")
+                    if digest:
+                        self.done[digest] = name
+        self._file = open(path, "a", encoding="utf-8")
+
+    def add(self, digest, name):
+        self.done[digest] = name
+        self._file.write(f"{digest}\t{name}\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def _spans(spans):
+    return [list(span) for span in spans[:MAX_SPANS]]
+
+
+def summarize(name, digest, outcome):
+    """출력할 JSON 한 줄 (규칙 설명문은 빼고 이름/위치/점수만)"""
+    if "error" in outcome:
+        return {"file": name, "sha256": digest, "error": outcome["error"]}
+
+    results = outcome["results"]
+    return {
+        "file": name,
+        "sha256": digest,
+        "score": results.score,
+        "max_score": results.max_score,
+        "text_length": outcome["text_length"],
+        "pages": len(results.pages) if results.pages else None,
+        "missing_required": results.missing("필수"),
+        "missing_recommended": results.missing("권장"),
+        "fees": results.fees,
+        "risks": [
+            {
+                "name": risk.name,
+                "level": results.risk_rule(risk.name)["risk_level"],
+                "articles": results.article_labels(risk),
+                "spans": _spans(risk.spans),
+            }
+            for risk in results.risks
+        ],
+        "specificity_issues": [
+            {"clause": clause.name, "spans": _spans(clause.specificity_spans)}
+            for clause in results.specificity_issues
+        ],
+        "timings": {"extract_ms": outcome["extract_ms"], "analyze_ms": outcome["analyze_ms"]},
+    }
+
+
+def run(paths, output, manifest_path, workers=None, chunksize=4):
+    """일괄 분석 실행 → (분석, 건너뜀, 오류) 건수"""
+    manifest = Manifest(manifest_path)
+    pending = {}        # 입력 번호 → (이름, 해시)
+    in_flight = {}      # 이번 실행에서 분석 중인 해시 → 이름 (같은 내용 파일은 한 번만 분석)
+    counts = {"analyzed": 0, "skipped": 0, "errors": 0}
+
+    def documents():
+        index = 0
+        for name, kind, data in iter_files(paths):
+            digest = hashlib.sha256(data).hexdigest()
+            if digest in manifest.done or digest in in_flight:
+                counts["skipped"] += 1
+                continue
+            in_flight[digest] = name
+            pending[index] = (name, digest)
+            index += 1
+            yield kind, data
+
+    try:
+        for index, outcome in analyze_documents(documents(), workers, chunksize, ordered=False):
+            name, digest = pending.pop(index)
+            line = summarize(name, digest, outcome)
+            output.write(json.dumps(line, ensure_ascii=False) + "\n")
+            output.flush()
+            # 결과 줄을 쓴 다음에 완료 표시 (중간에 멈추면 그 파일은 다시 분석됨)
+            manifest.add(digest, name)
+            del in_flight[digest]
+            counts["errors" if "error" in outcome else "analyzed"] += 1
+    finally:
+        manifest.close()
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="계약서 일괄 분석 (결과: 한 줄에 JSON 하나)")
+    parser.add_argument("inputs", nargs="+", help="PDF/TXT 파일, 폴더, zip/tar 압축 파일")
+    parser.add_argument("-o", "--output", help="결과 JSONL 경로 (기본: 표준 출력, 이어 쓰기)")
+    parser.add_argument("--manifest", help="완료 목록 경로 (기본: <출력 경로>.manifest)")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--chunksize", type=int, default=4, help="워커에 한 번에 보내는 파일 수")
+    args = parser.parse_args(argv)
+
+    if args.output:
+        output = open(args.output, "a", encoding="utf-8")
+        manifest_path = args.manifest or args.output + ".manifest"
+    else:
+        output = sys.stdout
+        manifest_path = args.manifest or "batch.manifest"
+
+    start = time.perf_counter()
+    try:
+        counts = run(args.inputs, output, manifest_path, args.workers, args.chunksize)
+    except KeyboardInterrupt:
+        print("중단됨 - 같은 명령으로 다시 실행하면 남은 파일부터 이어서 분석합니다", file=sys.stderr)
+        return 130
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    done = counts["analyzed"] + counts["errors"]
+    print(f"분석 {counts['analyzed']}건, 오류 {counts['errors']}건, 건너뜀 {counts['skipped']}건 "
+          f"({elapsed:.1f}초, 초당 {done / elapsed if elapsed else 0:.1f}건)", file=sys.stderr)
+    return 1 if counts["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
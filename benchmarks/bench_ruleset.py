@@ -0,0 +1,55 @@
+"""
+규칙 세트 공유 효과 측정
+요청마다 규칙을 새로 컴파일하던 방식과, 프로세스 공유 규칙 세트를 쓰는 방식을 비교
+
+실행: python benchmarks/bench_ruleset.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contract_analyzer import ContractAnalyzer, analyze_contract, sample_contract_good
+from contract_ruleset import DEFAULT_RULE_PACK, CompiledRuleset, compile_rule_pack, get_ruleset, load_rule_pack
+
+REPEAT = 200
+
+PACK, _ = load_rule_pack(DEFAULT_RULE_PACK)
+
+
+def per_request_compile():
+    """예전 방식: 요청마다 규칙 세트를 새로 만든 뒤 분석"""
+    ruleset = CompiledRuleset(PACK)
+    return analyze_contract(ruleset, sample_contract_good)
+
+
+def shared_ruleset():
+    """현재 방식: 공유 규칙 세트로 분석기 생성 후 분석"""
+    return ContractAnalyzer().analyze_contract(sample_contract_good)
+
+
+def measure(func):
+    """1회 평균 시간 (ms)"""
+    return min(timeit.repeat(func, number=REPEAT, repeat=3)) / REPEAT * 1000
+
+
+if __name__ == "__main__":
+    get_ruleset()  # 최초 1회 컴파일은 프로세스 시작 비용
+
+    construct_old = measure(lambda: CompiledRuleset(PACK))
+    construct_new = measure(ContractAnalyzer)
+    total_old = measure(per_request_compile)
+    total_new = measure(shared_ruleset)
+
+    print(f"{'':<24}{'요청마다 컴파일':>16}{'공유 규칙 세트':>16}")
+    print(f"{'분석기 생성 (ms)':<24}{construct_old:>16.3f}{construct_new:>16.3f}")
+    print(f"{'생성 + 분석 (ms)':<24}{total_old:>16.3f}{total_new:>16.3f}")
+    print(f"요청당 절감: {total_old - total_new:.3f} ms ({(1 - total_new / total_old) * 100:.0f}%)")
+
+    # 프로세스 시작 시 규칙 팩 준비 비용: 캐시 없이 컴파일 vs 캐시된 컴파일 결과 읽기
+    compile_rule_pack(DEFAULT_RULE_PACK)
+    cold = measure(lambda: compile_rule_pack(DEFAULT_RULE_PACK, cache_dir=None))
+    warm = measure(lambda: compile_rule_pack(DEFAULT_RULE_PACK))
+    print(f"규칙 팩 준비 (ms): 컴파일 {cold:.3f} / 캐시 읽기 {warm:.3f}")
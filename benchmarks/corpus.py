@@ -0,0 +1,188 @@
+"""
+벤치마크용 합성 계약서 생성기
+저장소의 샘플 계약서들을 조 단위로 쪼갠 뒤 다시 조합해서 원하는 크기의 계약서를 만든다
+(같은 seed면 항상 같은 본문)
+"""
+
+import io
+import os
+import random
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contract_analyzer import sample_contract_bad, sample_contract_good, sample_contract_vague
+from contract_segmenter import segment_articles
+
+SAMPLE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sample_contract.txt")
+
+PREAMBLE = """사건위임계약서
+
+위임인(갑): 홍길동
+수임인(을): 법무법인 정의
+
+"""
+
+SIGNATURE = """
+2024년 1월 15일
+
+위임인(갑): 홍길동 (인)
+수임인(을): 법무법인 정의
+담당변호사: 김정의 (등록번호: 12345)
+"""
+
+NAMES = ["홍길동", "이철수", "김영희", "박민수", "최지은"]
+
+
+def _templates():
+    texts = [sample_contract_good, sample_contract_bad, sample_contract_vague]
+    if os.path.exists(SAMPLE_FILE):
+        with open(SAMPLE_FILE, encoding="utf-8") as f:
+            texts.append(f.read())
+    return texts
+
+
+def template_articles():
+    """샘플 계약서의 조 목록 [(제목, 본문), ...]"""
+    articles = []
+    for text in _templates():
+        for article in segment_articles(text):
+            if article.kind != "조":
+                continue
+            chunk = text[article.start:article.end]
+            body = re.sub(r"^[ \t]*제[ \t]*\d+[ \t]*조[ \t]*(【[^】\n]*】)?", "", chunk, count=1).strip()
+            if body:
+                articles.append((article.title or "기타", body))
+    return articles
+
+
+def _vary(body, rng):
+    """금액/이름을 바꿔 같은 조항이라도 본문이 조금씩 달라지게 함"""
+    body = re.sub(r"\d[\d,]*", lambda m: f"{rng.randint(1, 999) * 10000:,}" if "," in m.group() else str(rng.randint(1, 99)), body)
+    for name in NAMES:
+        if name in body:
+            body = body.replace(name, rng.choice(NAMES))
+    return body
+
+
+def generate_contract(size, repetitive=0.0, seed=0):
+    """약 size 글자의 계약서 생성
+
+    repetitive: 0.0이면 매 조항을 새로 뽑고, 1.0에 가까울수록 직전 조항을 그대로 반복
+    """
+    rng = random.Random(seed)
+    pool = template_articles()
+    parts = [PREAMBLE]
+    total = len(PREAMBLE) + len(SIGNATURE)
+    previous = None
+    number = 1
+
+    while total < size:
+        if previous and rng.random() < repetitive:
+            title, body = previous
+        else:
+            title, body = rng.choice(pool)
+            body = _vary(body, rng)
+            previous = (title, body)
+        article = f"제{number}조【{title}】\n{body}\n\n"
+        parts.append(article)
+        total += len(article)
+        number += 1
+
+    parts.append(SIGNATURE)
+    return "".join(parts)
+
+
+def split_pages(text, page_chars=1800):
+    """본문을 PDF 페이지 크기로 나눔 (줄 단위)"""
+    pages = []
+    current = []
+    length = 0
+    for line in text.split("\n"):
+        if length + len(line) > page_chars and current:
+            pages.append("\n".join(current))
+            current = []
+            length = 0
+        current.append(line)
+        length += len(line) + 1
+    pages.append("\n".join(current))
+    return pages
+
+
+def _to_unicode_cmap(chars):
+    """한글 텍스트 추출용 ToUnicode CMap (2바이트 코드 = 유니코드 코드 포인트, 쓰인 글자만)"""
+    lines = [
+        b"/CIDInit /ProcSet findresource begin",
+        b"12 dict begin",
+        b"begincmap",
+        b"/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def",
+        b"/CMapName /Adobe-Identity-UCS def",
+        b"/CMapType 2 def",
+        b"1 begincodespacerange",
+        b"<0000> <FFFF>",
+        b"endcodespacerange",
+    ]
+    codes = sorted(ord(ch) for ch in chars if ord(ch) <= 0xFFFF)
+    for i in range(0, len(codes), 100):
+        block = codes[i:i + 100]
+        lines.append(b"%d beginbfchar" % len(block))
+        lines += [b"<%04X> <%04X>" % (code, code) for code in block]
+        lines.append(b"endbfchar")
+    lines += [b"endcmap", b"CMapName currentdict /CMap defineresource pop", b"end", b"end"]
+    return b"\n".join(lines)
+
+
+def make_pdf(pages):
+    """페이지별 텍스트로 최소한의 PDF 생성 (글꼴은 넣지 않음 - 텍스트 추출 측정용)"""
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    def stream(data):
+        return b"<< /Length %d >>\nstream\n" % len(data) + data + b"\nendstream"
+
+    catalog = add(None)
+    pages_id = add(None)
+    to_unicode = add(stream(_to_unicode_cmap(set("".join(pages)))))
+    descendant = add(b"<< /Type /Font /Subtype /CIDFontType2 /BaseFont /NanumGothic "
+                     b"/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> "
+                     b"/CIDToGIDMap /Identity >>")
+    font = add(b"<< /Type /Font /Subtype /Type0 /BaseFont /NanumGothic /Encoding /Identity-H "
+               b"/DescendantFonts [%d 0 R] /ToUnicode %d 0 R >>" % (descendant, to_unicode))
+
+    kids = []
+    for text in pages:
+        operations = [b"BT /F1 10 Tf 40 800 Td 12 TL"]
+        for line in text.split("\n"):
+            operations.append(b"<" + line.encode("utf-16-be").hex().encode() + b"> Tj T*")
+        operations.append(b"ET")
+        content = add(stream(b"\n".join(operations)))
+        kids.append(add(b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+                        b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_id, font, content)))
+
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), len(kids))
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref))
+    return out.getvalue()
+
+
+if __name__ == "__main__":
+    # 예: python benchmarks/corpus.py 10000 0.5 > contract.txt
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    repetitive = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    sys.stdout.write(generate_contract(size, repetitive))
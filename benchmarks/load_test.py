@@ -0,0 +1,153 @@
+"""
+HTTP API 부하 테스트
+로컬에 api_server를 띄우고(또는 --url로 지정한 서버에) 동시 요청 수를 늘려 가며
+지연 시간 p50/p99, 처리량, 거절(503) 비율을 재고, 감당할 수 있는 최대 RPS를 알려준다
+
+실행:
+    python benchmarks/load_test.py                          # 로컬 서버를 띄워서 측정
+    python benchmarks/load_test.py --url http://host:8502   # 이미 떠 있는 서버 측정
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from corpus import generate_contract
+
+# 동시 요청 수 단계
+DEFAULT_LEVELS = [1, 2, 4, 8, 16, 32]
+
+# 감당 가능 기준: 거절 비율과 p99 지연 시간 상한
+MAX_REJECT_RATIO = 0.01
+DEFAULT_P99_SLO_MS = 2000
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _post(url, body):
+    request = urllib.request.Request(url + "/analyze", data=body, method="POST",
+                                     headers={"Content-Type": "text/plain; charset=utf-8"})
+    try:
+        with urllib.request.urlopen(request, timeout=120) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        return e.code
+    except OSError:
+        return 0
+
+
+def run_level(url, bodies, concurrency, seconds):
+    """concurrency개 클라이언트가 seconds 동안 쉬지 않고 요청 (닫힌 루프)"""
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + seconds
+
+    def client(number):
+        i = number
+        while time.perf_counter() < stop_at:
+            # 결과 캐시에 걸리지 않도록 요청마다 관리번호를 붙임
+            body = bodies[i % len(bodies)] + f"\n관리번호: {number}-{i}\n".encode("utf-8")
+            i += concurrency
+            start = time.perf_counter()
+            status = _post(url, body)
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                statuses[status] = statuses.get(status, 0) + 1
+                if status == 200:
+                    latencies.append(elapsed)
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    total = sum(statuses.values())
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "ok": statuses.get(200, 0),
+        "rejected": statuses.get(503, 0),
+        "errors": total - statuses.get(200, 0) - statuses.get(503, 0),
+        "rps": round(statuses.get(200, 0) / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 0.50) or 0, 2),
+        "p99_ms": round(percentile(latencies, 0.99) or 0, 2),
+    }
+
+
+def sustainable(level, p99_slo_ms):
+    if not level["requests"] or level["errors"]:
+        return False
+    return level["rejected"] / level["requests"] <= MAX_REJECT_RATIO and level["p99_ms"] <= p99_slo_ms
+
+
+def _start_local_server(workers, queue_size):
+    from api_server import ApiServer
+
+    server = ApiServer(("127.0.0.1", 0), workers, queue_size)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="계약서 분석 API 부하 테스트")
+    parser.add_argument("--url", help="측정할 서버 주소 (없으면 로컬 서버를 띄움)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="로컬 서버 분석 프로세스 수")
+    parser.add_argument("--queue", type=int, default=16, help="로컬 서버 대기 요청 수")
+    parser.add_argument("--levels", default=",".join(map(str, DEFAULT_LEVELS)), help="동시 요청 수 단계 (쉼표 구분)")
+    parser.add_argument("--seconds", type=float, default=5.0, help="단계별 측정 시간")
+    parser.add_argument("--size", type=int, default=5000, help="계약서 크기 (글자 수)")
+    parser.add_argument("--p99-slo", type=float, default=DEFAULT_P99_SLO_MS, help="p99 지연 시간 상한 (ms)")
+    args = parser.parse_args(argv)
+
+    server = None
+    url = args.url
+    if url is None:
+        server, url = _start_local_server(args.workers, args.queue)
+
+    bodies = [generate_contract(args.size, seed=seed).encode("utf-8") for seed in range(16)]
+
+    levels = []
+    try:
+        for concurrency in map(int, args.levels.split(",")):
+            level = run_level(url, bodies, concurrency, args.seconds)
+            levels.append(level)
+            print(f"동시 {concurrency:>3}: {level['rps']:>8.2f} rps  p50 {level['p50_ms']:>8.2f} ms  "
+                  f"p99 {level['p99_ms']:>8.2f} ms  거절 {level['rejected']}  오류 {level['errors']}",
+                  file=sys.stderr)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    ok_levels = [level for level in levels if sustainable(level, args.p99_slo)]
+    report = {
+        "url": url if args.url else "local",
+        "size": args.size,
+        "levels": levels,
+        "max_sustainable_rps": max((level["rps"] for level in ok_levels), default=0),
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
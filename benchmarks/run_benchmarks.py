@@ -0,0 +1,168 @@
+"""
+성능 벤치마크
+합성 계약서로 analyze_contract / generate_report / generate_improvement_request / PDF 텍스트 추출을
+각각 따로 측정하고, 저장된 기준값(baseline.json)보다 느려지면 실패로 끝난다
+
+실행:
+    python benchmarks/run_benchmarks.py                    # 기본 크기 (1KB ~ 1MB)
+    python benchmarks/run_benchmarks.py --full             # 최대 32MB까지
+    python benchmarks/run_benchmarks.py --update-baseline  # 현재 결과를 기준값으로 저장
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from contract_analyzer import ContractAnalyzer, analyze_contract, generate_improvement_request
+from contract_ruleset import get_ruleset
+
+from corpus import generate_contract, make_pdf, split_pages
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+
+# 크기별 이름 → 글자 수
+SIZES = {"1KB": 1_000, "10KB": 10_000, "100KB": 100_000, "1MB": 1_000_000}
+FULL_SIZES = dict(SIZES, **{"10MB": 10_000_000, "32MB": 32_000_000})
+
+# 본문 종류 → 직전 조항 반복 비율
+KINDS = {"clean": 0.0, "repetitive": 0.9}
+
+# PDF 추출은 페이지 수에 비례해 느리므로 이 크기까지만 측정
+PDF_MAX_CHARS = 100_000
+
+# 기준값보다 이 배수 이상 느리고, 차이가 MIN_REGRESSION_MS 이상이면 실패
+DEFAULT_TOLERANCE = 2.0
+MIN_REGRESSION_MS = 1.0
+
+
+def timed(func, repeat):
+    """repeat번 실행 중 가장 빠른 시간 (ms)"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _repeat_for(chars, repeat):
+    # 큰 본문은 한 번만 (수 초 단위)
+    return repeat if chars <= 100_000 else 1
+
+
+def run(sizes, repeat):
+    """측정 결과 {"단계/종류/크기": ms}"""
+    ruleset = get_ruleset()
+    analyzer = ContractAnalyzer(ruleset)
+    measurements = {}
+
+    for kind, repetitive in KINDS.items():
+        for size_name, chars in sizes.items():
+            text = generate_contract(chars, repetitive)
+            n = _repeat_for(chars, repeat)
+            results = analyze_contract(ruleset, text)
+
+            measurements[f"analyze_contract/{kind}/{size_name}"] = timed(lambda: analyze_contract(ruleset, text), n)
+            measurements[f"generate_report/{kind}/{size_name}"] = timed(lambda: analyzer.generate_report(results), n)
+            measurements[f"generate_improvement_request/{kind}/{size_name}"] = timed(
+                lambda: generate_improvement_request(results), n)
+
+            if chars <= PDF_MAX_CHARS:
+                pdf_times = _time_pdf(text, n)
+                if pdf_times is not None:
+                    measurements[f"pdf_extract/{kind}/{size_name}"] = pdf_times[0]
+                    measurements[f"pdf_extract_parallel/{kind}/{size_name}"] = pdf_times[1]
+
+    return measurements
+
+
+def _time_pdf(text, repeat):
+    """PDF 텍스트 추출 시간 (한 쪽씩 순서대로, pdf_extractor 병렬 추출) - PyPDF2가 없으면 None"""
+    try:
+        import PyPDF2
+        from pdf_extractor import extract_pdf
+    except ImportError:
+        return None
+
+    data = make_pdf(split_pages(text))
+
+    def extract():
+        reader = PyPDF2.PdfReader(io.BytesIO(data))
+        return [page.extract_text() for page in reader.pages]
+
+    return timed(extract, repeat), timed(lambda: extract_pdf(data), repeat)
+
+
+def compare(measurements, baseline, tolerance):
+    """기준값보다 느려진 항목 [(이름, 기준 ms, 현재 ms), ...]"""
+    regressions = []
+    for name, base_ms in baseline.get("results", {}).items():
+        current = measurements.get(name)
+        if current is None:
+            continue
+        if current > base_ms * tolerance and current - base_ms >= MIN_REGRESSION_MS:
+            regressions.append((name, base_ms, current))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="계약서 분석 성능 벤치마크")
+    parser.add_argument("--full", action="store_true", help="10MB / 32MB 본문까지 측정")
+    parser.add_argument("--repeat", type=int, default=5, help="작은 본문 반복 측정 횟수 (가장 빠른 값 사용)")
+    parser.add_argument("--output", help="측정 결과 JSON 저장 경로 (기본: 표준 출력)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="기준값 JSON 경로")
+    parser.add_argument("--update-baseline", action="store_true", help="현재 결과를 기준값으로 저장")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="허용 배수 (기본 2.0)")
+    args = parser.parse_args(argv)
+
+    measurements = run(FULL_SIZES if args.full else SIZES, args.repeat)
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "ruleset": get_ruleset().label,
+        "results": {name: round(ms, 3) for name, ms in measurements.items()},
+    }
+
+    payload = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload + "\n")
+    else:
+        print(payload)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            f.write(payload + "\n")
+        print(f"기준값 저장: {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"기준값 파일이 없습니다: {args.baseline} (--update-baseline으로 생성)", file=sys.stderr)
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    regressions = compare(measurements, baseline, args.tolerance)
+    if regressions:
+        print("=" * 60, file=sys.stderr)
+        print(f"🚨 성능 저하 {len(regressions)}건 (허용 {args.tolerance}배)", file=sys.stderr)
+        print("=" * 60, file=sys.stderr)
+        for name, base_ms, current in regressions:
+            print(f"  {name}: {base_ms:.3f} ms → {current:.3f} ms ({current / base_ms:.1f}배)", file=sys.stderr)
+        return 1
+
+    print(f"✅ 기준값 대비 성능 저하 없음 ({len(measurements)}개 항목)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
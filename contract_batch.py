@@ -0,0 +1,135 @@
+"""
+대량 계약서 분석
+여러 프로세스에 나눠 분석하고, 결과를 입력 순서 또는 끝나는 순서대로 돌려준다
+(본문 문자열은 analyze_many, PDF/TXT 파일 내용은 analyze_documents)
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+from contract_analyzer import analyze_contract
+from contract_ruleset import get_ruleset
+from pdf_extractor import extract_pdf
+
+# 워커 프로세스의 규칙 세트 (워커당 한 번만 컴파일)
+_worker_ruleset = None
+
+
+def _init_worker():
+    global _worker_ruleset
+    _worker_ruleset = get_ruleset()
+
+
+def _analyze_chunk(texts):
+    return [analyze_contract(_worker_ruleset, text) for text in texts]
+
+
+def _chunks(texts, chunksize):
+    """(시작 번호, [본문, ...]) 묶음을 필요할 때마다 하나씩 생성"""
+    iterator = iter(texts)
+    start = 0
+    while True:
+        chunk = list(islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def analyze_many(texts, workers=None, chunksize=16, ordered=True, max_pending=None):
+    """여러 계약서를 병렬로 분석해 (입력 번호, 분석 결과)를 하나씩 반환
+
+    texts: 본문 iterable (제너레이터 가능 - 필요한 만큼만 읽음)
+    workers: 프로세스 수 (기본: CPU 수, 1이면 현재 프로세스에서 처리)
+    chunksize: 워커에 한 번에 보내는 계약서 수
+    ordered: True면 입력 순서, False면 분석이 끝나는 순서
+    max_pending: 동시에 처리 중이거나 대기 중인 묶음 수 상한 (기본: workers * 2)
+        메모리에는 최대 max_pending * chunksize 건의 본문/결과만 올라간다.
+    """
+    return _map_chunks(_analyze_chunk, texts, workers, chunksize, ordered, max_pending)
+
+
+def analyze_documents(documents, workers=None, chunksize=4, ordered=True, max_pending=None):
+    """파일 내용을 병렬로 추출 + 분석해 (입력 번호, 결과)를 하나씩 반환
+
+    documents: (종류, 내용 bytes) iterable - 종류는 "pdf" / "txt"
+    결과는 analyze_document()와 같다. 나머지 인자는 analyze_many()와 같다.
+    """
+    return _map_chunks(_analyze_document_chunk, documents, workers, chunksize, ordered, max_pending)
+
+
+def decode_text(data):
+    """텍스트 파일 내용 → 문자열 (UTF-8, 안 되면 CP949)"""
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return data.decode("cp949", errors="replace")
+
+
+def analyze_document(ruleset, kind, data):
+    """파일 하나 추출 + 분석 → {"results", "text_length", "extract_ms", "analyze_ms"} (실패하면 {"error"})"""
+    try:
+        start = time.perf_counter()
+        pages = None
+        if kind == "pdf":
+            document = extract_pdf(data, workers=1)
+            text = document.text
+            pages = document.page_ranges()
+        else:
+            text = decode_text(data)
+        extracted = time.perf_counter()
+        results = analyze_contract(ruleset, text)
+        if pages is not None:
+            results.pages = pages
+        return {
+            "results": results,
+            "text_length": len(text),
+            "extract_ms": round((extracted - start) * 1000, 3),
+            "analyze_ms": round((time.perf_counter() - extracted) * 1000, 3),
+        }
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+def _analyze_document_chunk(documents):
+    return [analyze_document(_worker_ruleset, kind, data) for kind, data in documents]
+
+
+def _map_chunks(work, items, workers, chunksize, ordered, max_pending):
+    """work(묶음)을 프로세스 풀에서 돌려 (입력 번호, 결과)를 하나씩 반환 (대기 묶음 수 제한)"""
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(items, chunksize)
+
+    if workers == 1:
+        _init_worker()
+        for start, chunk in chunks:
+            for offset, results in enumerate(work(chunk)):
+                yield start + offset, results
+        return
+
+    max_pending = max_pending or workers * 2
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        def submit(chunk_item):
+            start, chunk = chunk_item
+            return start, pool.submit(work, chunk)
+
+        pending = deque(submit(item) for item in islice(chunks, max_pending))
+
+        while pending:
+            if ordered:
+                # 맨 앞 묶음이 끝날 때까지 기다려야 순서가 유지됨
+                start, future = pending.popleft()
+            else:
+                done, _ = wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+                start, future = next(item for item in pending if item[1] in done)
+                pending.remove((start, future))
+
+            for item in islice(chunks, 1):
+                pending.append(submit(item))
+
+            for offset, results in enumerate(future.result()):
+                yield start + offset, results
@@ -0,0 +1,73 @@
+"""
+수정된 본문 재분석
+이전 분석의 조별 매칭 결과를 조 내용 해시로 보관해 두고,
+다시 분석할 때는 내용이 바뀐 조만 새로 훑는다
+"""
+
+import hashlib
+
+from amount_extractor import amounts_near
+from contract_analyzer import analyze_index
+from contract_ruleset import get_ruleset
+from contract_segmenter import ContractIndex, segment_articles
+
+
+def _article_key(chunk):
+    """조 내용 해시 (본문 대신 해시만 보관)"""
+    return hashlib.blake2b(chunk.encode("utf-8"), digest_size=16).digest()
+
+
+class IncrementalAnalyzer:
+    """세션별 재분석기
+
+    조 내용 해시 → 조 안에서의 상대 매치 위치(와 금액)만 보관하므로 원문은 남지 않는다.
+    결과는 analyze_contract()와 같다 (두 조에 걸친 키워드는 어느 조에도 속하지 않으므로 제외).
+    """
+
+    def __init__(self, ruleset=None):
+        self.ruleset = ruleset or get_ruleset()
+        self.last_scanned = 0       # 마지막 분석에서 새로 훑은 글자 수
+        self._cache = {}
+
+    def analyze(self, text):
+        """본문 분석 (바뀐 조만 다시 매칭)"""
+        matcher = self.ruleset.matcher
+        amount_keywords = self.ruleset.amount_keywords
+        articles = segment_articles(text)
+        matches = []
+        amounts = {}
+        cache = {}
+        self.last_scanned = 0
+
+        for article in articles:
+            chunk = text[article.start:article.end]
+            key = _article_key(chunk)
+            cached = cache.get(key) or self._cache.get(key)
+            if cached is None:
+                local, _ = matcher.scan(chunk)
+                local_amounts = amounts_near(
+                    chunk, [(start, end) for start, end, index in local
+                            if not amount_keywords.isdisjoint(matcher.names[index])])
+                cached = (local, local_amounts)
+                self.last_scanned += len(chunk)
+            cache[key] = cached
+            local, local_amounts = cached
+            offset = article.start
+            matches += [(start + offset, end + offset, index) for start, end, index in local]
+            for (start, end), found in local_amounts.items():
+                amounts[(start + offset, end + offset)] = [amount.shifted(offset) for amount in found]
+
+        # 지금 본문에 있는 조만 남김
+        self._cache = cache
+
+        index = ContractIndex(
+            len(text),
+            articles,
+            matcher.collect(matches),
+            [pattern.keyword for pattern in matcher.gap_patterns],
+            amounts
+        )
+        return analyze_index(self.ruleset, index)
+
+    def clear(self):
+        self._cache = {}
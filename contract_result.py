@@ -0,0 +1,242 @@
+"""
+분석 결과 타입
+규칙 설명문은 담지 않고 규칙 이름, 찾았는지 여부, 근거 위치, 점수 구성만 담는다.
+설명문은 화면/리포트를 만들 때 결과를 만든 규칙 세트에서 찾는다.
+캐시나 워커 프로세스 사이에서 주고받기 위한 JSON / 바이너리 변환을 제공한다
+"""
+
+import hashlib
+import marshal
+
+from contract_ruleset import find_ruleset
+
+# 바이너리 형식이 바뀌면 올림
+FORMAT_VERSION = 2
+
+# fingerprint()용 marshal 형식 (2는 객체 참조를 쓰지 않아 내용이 같으면 항상 같은 바이트)
+_CANONICAL_MARSHAL_VERSION = 2
+
+# 조항 구체성 판정
+VAGUE = "모호함"
+SPECIFIC = "구체적"
+
+
+class UnknownRuleset(LookupError):
+    """결과를 만든 규칙 세트를 이 프로세스에서 찾을 수 없음 (다른 규칙 세트로 설명문을 붙이면 안 됨)"""
+
+
+class ClauseCheck:
+    """필수/권장 조항 하나의 확인 결과
+
+    spans: 조항 키워드 근거 위치 [(start, end, keyword), ...]
+    specificity: 구체성 판정 (VAGUE / SPECIFIC, 판정 대상이 아니면 None)
+    specificity_spans: 구체성 판정 근거 위치
+    """
+
+    __slots__ = ("name", "found", "spans", "specificity", "specificity_spans")
+
+    def __init__(self, name, found, spans, specificity=None, specificity_spans=()):
+        self.name = name
+        self.found = found
+        self.spans = spans
+        self.specificity = specificity
+        self.specificity_spans = specificity_spans
+
+    def to_tuple(self):
+        return (self.name, self.found, self.spans, self.specificity, self.specificity_spans)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "found": self.found,
+            "spans": [list(span) for span in self.spans],
+            "specificity": self.specificity,
+            "specificity_spans": [list(span) for span in self.specificity_spans],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["name"], data["found"], [tuple(span) for span in data["spans"]],
+                   data["specificity"], [tuple(span) for span in data["specificity_spans"]])
+
+
+class RiskHit:
+    """발견된 위험 패턴 하나
+
+    articles: 근거가 나온 조 (결과의 articles 목록 순번)
+    spans: 근거 위치 [(start, end, keyword), ...]
+    """
+
+    __slots__ = ("name", "articles", "spans")
+
+    def __init__(self, name, articles, spans):
+        self.name = name
+        self.articles = articles
+        self.spans = spans
+
+    def to_tuple(self):
+        return (self.name, self.articles, self.spans)
+
+    def to_dict(self):
+        return {"name": self.name, "articles": list(self.articles), "spans": [list(span) for span in self.spans]}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["name"], tuple(data["articles"]), [tuple(span) for span in data["spans"]])
+
+
+class ContractResult:
+    """계약서 한 건의 분석 결과
+
+    ruleset: 결과를 만든 규칙 세트 (공유 객체 참조 - 설명문은 여기서 찾음)
+    articles: 조 구간 [(start, end, 표시 이름), ...]
+    pages: PDF에서 읽은 경우 쪽 구간 [(쪽 번호, start, end), ...] (아니면 None)
+    partial: 본문 일부만 분석한 경우 {"reason", "done", "total"} (아니면 None)
+    fees: 본문에서 읽은 보수 조건 {"retainer", "success_rate", "success_amount", "hourly_rate"}
+        (원 / %, 못 찾은 항목은 None - 규칙 세트에 보수 항목이 없으면 None)
+    """
+
+    __slots__ = ("ruleset", "score", "max_score", "required_points", "recommended_points",
+                 "risk_penalty", "specificity_penalty", "clauses", "risks", "articles", "pages", "partial",
+                 "fees")
+
+    def __init__(self, ruleset, score, max_score, required_points, recommended_points,
+                 risk_penalty, specificity_penalty, clauses, risks, articles, pages=None, partial=None,
+                 fees=None):
+        self.ruleset = ruleset
+        self.score = score
+        self.max_score = max_score
+        self.required_points = required_points
+        self.recommended_points = recommended_points
+        self.risk_penalty = risk_penalty
+        self.specificity_penalty = specificity_penalty
+        self.clauses = clauses
+        self.risks = risks
+        self.articles = articles
+        self.pages = pages
+        self.partial = partial
+        self.fees = fees
+
+    # 규칙 설명 찾기 (화면/리포트를 만들 때만)
+
+    def clause_rule(self, name):
+        return self.ruleset.required_clauses[name]
+
+    def risk_rule(self, name):
+        return self.ruleset.risk_patterns[name]
+
+    def clauses_of(self, importance):
+        """중요도("필수" / "권장")별 [(ClauseCheck, 규칙), ...]"""
+        clauses = self.ruleset.required_clauses
+        return [(clause, clauses[clause.name]) for clause in self.clauses
+                if clauses[clause.name]["importance"] == importance]
+
+    def missing(self, importance):
+        """빠진 조항 이름 목록"""
+        return [clause.name for clause, _ in self.clauses_of(importance) if not clause.found]
+
+    @property
+    def specificity_issues(self):
+        """조항은 있지만 모호하게 적힌 조항들"""
+        return [clause for clause in self.clauses if clause.specificity == VAGUE]
+
+    def article_labels(self, risk):
+        return [self.articles[i][2] for i in risk.articles]
+
+    # 변환
+
+    def to_tuple(self):
+        """기본 타입만으로 된 튜플 (marshal / pickle용)"""
+        return (
+            FORMAT_VERSION,
+            self.ruleset.content_hash,
+            self.score, self.max_score,
+            self.required_points, self.recommended_points, self.risk_penalty, self.specificity_penalty,
+            [clause.to_tuple() for clause in self.clauses],
+            [risk.to_tuple() for risk in self.risks],
+            self.articles, self.pages, self.partial, self.fees,
+        )
+
+    @classmethod
+    def from_tuple(cls, state, ruleset=None):
+        if state[0] != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 결과 형식입니다 (버전 {state[0]})")
+        (_, content_hash, score, max_score, required_points, recommended_points, risk_penalty,
+         specificity_penalty, clauses, risks, articles, pages, partial, fees) = state
+        return cls(
+            ruleset or _resolve_ruleset(content_hash),
+            score, max_score, required_points, recommended_points, risk_penalty, specificity_penalty,
+            [ClauseCheck(*clause) for clause in clauses],
+            [RiskHit(*risk) for risk in risks],
+            articles, pages, partial, fees,
+        )
+
+    def to_bytes(self):
+        """바이너리 (같은 파이썬 버전의 캐시 / 워커 프로세스 사이 전달용)
+
+        같은 내용이라도 문자열 객체 공유 여부에 따라 바이트가 다를 수 있다 (비교에는 fingerprint()).
+        """
+        return marshal.dumps(self.to_tuple())
+
+    @classmethod
+    def from_bytes(cls, data, ruleset=None):
+        return cls.from_tuple(marshal.loads(data), ruleset)
+
+    def fingerprint(self):
+        """내용 해시 (내용이 같은 결과면 같은 값)"""
+        encoded = marshal.dumps(self.to_tuple(), _CANONICAL_MARSHAL_VERSION)
+        return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+    def to_dict(self):
+        """JSON으로 보낼 수 있는 dict (규칙 설명문 없음)"""
+        return {
+            "ruleset": self.ruleset.label,
+            "ruleset_hash": self.ruleset.content_hash,
+            "score": self.score,
+            "max_score": self.max_score,
+            "components": {
+                "required_points": self.required_points,
+                "recommended_points": self.recommended_points,
+                "risk_penalty": self.risk_penalty,
+                "specificity_penalty": self.specificity_penalty,
+            },
+            "clauses": [clause.to_dict() for clause in self.clauses],
+            "risks": [risk.to_dict() for risk in self.risks],
+            "articles": [list(article) for article in self.articles],
+            "pages": [list(page) for page in self.pages] if self.pages is not None else None,
+            "partial": self.partial,
+            "fees": self.fees,
+        }
+
+    @classmethod
+    def from_dict(cls, data, ruleset=None):
+        components = data["components"]
+        pages = data["pages"]
+        return cls(
+            ruleset or _resolve_ruleset(data["ruleset_hash"]),
+            data["score"], data["max_score"],
+            components["required_points"], components["recommended_points"],
+            components["risk_penalty"], components["specificity_penalty"],
+            [ClauseCheck.from_dict(clause) for clause in data["clauses"]],
+            [RiskHit.from_dict(risk) for risk in data["risks"]],
+            [tuple(article) for article in data["articles"]],
+            [tuple(page) for page in pages] if pages is not None else None,
+            data["partial"],
+            data["fees"],
+        )
+
+    def __reduce__(self):
+        # 프로세스 사이에서는 규칙 세트 대신 내용 해시만 보냄
+        return (_restore_result, (self.to_bytes(),))
+
+
+def _resolve_ruleset(content_hash):
+    """결과를 만든 규칙 세트 (이 프로세스에서 읽은 적이 없으면 UnknownRuleset)"""
+    ruleset = find_ruleset(content_hash) if content_hash else None
+    if ruleset is None:
+        raise UnknownRuleset(f"결과를 만든 규칙 세트를 찾을 수 없습니다 ({content_hash or '내용 해시 없음'})")
+    return ruleset
+
+
+def _restore_result(data):
+    return ContractResult.from_bytes(data)
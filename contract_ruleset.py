@@ -0,0 +1,294 @@
+"""
+계약서 분석 규칙 세트
+규칙 팩 파일(rules/*.json)을 읽어 읽기 전용 규칙 세트로 컴파일한다.
+컴파일 결과는 팩 내용 해시로 캐시해 두고, 실행 중에는 팩이 바뀌면 새 규칙 세트로 교체한다
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from contract_segmenter import SENTENCE_ENDS
+from keyword_matcher import KeywordMatcher
+from text_normalizer import dedupe_keywords
+
+RULES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules")
+
+# 기본 규칙 팩 (환경변수로 교체 가능)
+DEFAULT_RULE_PACK = os.environ.get("CONGA_RULE_PACK", os.path.join(RULES_DIR, "conga_v5.json"))
+
+# 컴파일 결과 캐시 위치
+CACHE_DIR = os.environ.get("CONGA_RULE_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "conga"))
+
+# 컴파일 결과 형식이 바뀌면 올림 (이전 캐시 무효화)
+COMPILER_VERSION = 5
+
+# 규칙 팩 변경 확인 간격 (초)
+RELOAD_CHECK_SECONDS = 2.0
+
+# 내용 해시로 다시 찾을 수 있게 기억해 두는 최근 규칙 세트 수
+MAX_RECENT_RULESETS = 8
+
+# 규칙에서 키워드 목록인 항목
+KEYWORD_FIELDS = ("keywords", "anti_keywords", "vague_keywords", "specific_keywords", "specificity_keywords")
+
+# 근접 조건 ("near": {"keywords": [...], "within": "sentence" 또는 글자 수, "unless": [...]})의 키워드 목록
+NEAR_FIELDS = ("keywords", "unless")
+
+
+class FrozenDict(dict):
+    """수정할 수 없는 dict (여러 세션/스레드가 공유해도 안전)"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("규칙 세트는 읽기 전용입니다")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def _dedupe_rules(rules):
+    """규칙마다 정규화하면 같아지는 키워드는 하나만 남김 (같은 위치가 근거로 두 번 나오지 않게)"""
+    def dedupe(field, value):
+        if field in KEYWORD_FIELDS:
+            return dedupe_keywords(value)
+        if field == "near":
+            return {key: dedupe_keywords(keywords) if key in NEAR_FIELDS else keywords
+                    for key, keywords in value.items()}
+        return value
+
+    return {
+        name: {field: dedupe(field, value) for field, value in rule_data.items()}
+        for name, rule_data in rules.items()
+    }
+
+
+def _freeze(value):
+    """dict/list를 재귀적으로 읽기 전용 구조로 변환"""
+    if isinstance(value, dict):
+        return FrozenDict((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class CompiledRuleset:
+    """컴파일된 읽기 전용 규칙 세트
+
+    규칙 정의, 점수 가중치, 키워드 매칭 엔진, 점수 계산에 필요한 집계값을 한 번에 만들어 둔다.
+    생성 후에는 바꿀 수 없으므로 프로세스 전체에서 공유해도 된다.
+    """
+
+    __slots__ = ("name", "version", "content_hash", "scoring", "required_clauses", "risk_patterns",
+                 "fee_terms", "matcher", "total_required", "total_recommended")
+
+    def __init__(self, pack, content_hash=None):
+        required_clauses = _freeze(_dedupe_rules(pack["required_clauses"]))
+        risk_patterns = _freeze(_dedupe_rules(pack["risk_patterns"]))
+        # 보수 항목 → 키워드 (앞뒤의 금액을 읽음)
+        fee_terms = _freeze({term: dedupe_keywords(keywords) for term, keywords in pack.get("fee_terms", {}).items()})
+
+        keywords = []
+        for clause_data in required_clauses.values():
+            keywords += clause_data["keywords"]
+            keywords += clause_data.get("specificity_keywords", ())
+            keywords += clause_data.get("vague_keywords", ())
+        for pattern_data in risk_patterns.values():
+            keywords += pattern_data["keywords"]
+            keywords += pattern_data.get("anti_keywords", ())
+            keywords += pattern_data.get("vague_keywords", ())
+            keywords += pattern_data.get("specific_keywords", ())
+            near = pattern_data.get("near")
+            if near:
+                keywords += near.get("keywords", ())
+                keywords += near.get("unless", ())
+                # 같은 문장 조건은 문장 끝 위치가 필요함
+                if near.get("within", "sentence") == "sentence":
+                    keywords += SENTENCE_ENDS
+        for fee_keywords in fee_terms.values():
+            keywords += fee_keywords
+
+        self._set(
+            name=pack.get("name", "rules"),
+            version=str(pack.get("version", "0")),
+            content_hash=content_hash,
+            scoring=_freeze(pack["scoring"]),
+            required_clauses=required_clauses,
+            risk_patterns=risk_patterns,
+            fee_terms=fee_terms,
+            matcher=KeywordMatcher(keywords),
+            total_required=sum(1 for c in required_clauses.values() if c["importance"] == "필수"),
+            total_recommended=sum(1 for c in required_clauses.values() if c["importance"] == "권장"),
+        )
+
+    def _set(self, **values):
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    @property
+    def label(self):
+        return f"{self.name} v{self.version}"
+
+    @property
+    def amount_keywords(self):
+        """뒤따르는 금액을 읽어야 하는 키워드 (check_amount 위험 패턴과 보수 항목의 키워드)"""
+        keywords = {keyword for pattern_data in self.risk_patterns.values()
+                    if pattern_data.get("check_amount") for keyword in pattern_data["keywords"]}
+        for fee_keywords in self.fee_terms.values():
+            keywords.update(fee_keywords)
+        return frozenset(keywords)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("규칙 세트는 읽기 전용입니다")
+
+    def __delattr__(self, name):
+        raise AttributeError("규칙 세트는 읽기 전용입니다")
+
+    def __reduce__(self):
+        # 컴파일된 매칭 엔진까지 그대로 저장 (읽을 때 다시 컴파일하지 않음)
+        return (_restore_ruleset, ({name: getattr(self, name) for name in self.__slots__},))
+
+
+def _restore_ruleset(state):
+    ruleset = CompiledRuleset.__new__(CompiledRuleset)
+    ruleset._set(**state)
+    return ruleset
+
+
+# 내용 해시 → 최근에 읽은 규칙 세트 (저장해 둔 분석 결과를 다시 읽을 때, 그 결과를 만든 규칙 세트를 찾음)
+_recent_rulesets = OrderedDict()
+_recent_lock = threading.Lock()
+
+
+def _remember(ruleset):
+    with _recent_lock:
+        _recent_rulesets[ruleset.content_hash] = ruleset
+        _recent_rulesets.move_to_end(ruleset.content_hash)
+        while len(_recent_rulesets) > MAX_RECENT_RULESETS:
+            _recent_rulesets.popitem(last=False)
+    return ruleset
+
+
+def find_ruleset(content_hash):
+    """이 프로세스에서 읽은 규칙 세트 중 내용 해시가 같은 것 (없으면 None)"""
+    with _recent_lock:
+        return _recent_rulesets.get(content_hash)
+
+
+def load_rule_pack(path):
+    """규칙 팩 파일 읽기 - (팩 dict, 내용 해시)"""
+    raw = _read_pack(path)
+    return json.loads(raw.decode("utf-8")), hashlib.sha256(raw).hexdigest()
+
+
+def _read_pack(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def compile_rule_pack(path, cache_dir=CACHE_DIR):
+    """규칙 팩 파일을 규칙 세트로 컴파일 (같은 내용은 캐시된 컴파일 결과를 바로 읽음)"""
+    raw = _read_pack(path)
+    content_hash = hashlib.sha256(raw).hexdigest()
+
+    artifact = None
+    if cache_dir:
+        artifact = os.path.join(cache_dir, f"ruleset-c{COMPILER_VERSION}-{content_hash[:32]}.pickle")
+        try:
+            with open(artifact, "rb") as f:
+                ruleset = pickle.load(f)
+            if isinstance(ruleset, CompiledRuleset) and ruleset.content_hash == content_hash:
+                return _remember(ruleset)
+        except FileNotFoundError:
+            pass
+        except (OSError, pickle.UnpicklingError, AttributeError, EOFError, TypeError):
+            pass  # 손상되었거나 형식이 다른 캐시는 다시 컴파일
+
+    ruleset = CompiledRuleset(json.loads(raw.decode("utf-8")), content_hash)
+    if artifact:
+        _write_artifact(artifact, ruleset)
+    return _remember(ruleset)
+
+
+def _write_artifact(artifact, ruleset):
+    """컴파일 결과 저장 (임시 파일에 쓴 뒤 교체 - 동시에 읽는 프로세스가 깨진 파일을 보지 않음)"""
+    try:
+        os.makedirs(os.path.dirname(artifact), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(artifact), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(ruleset, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, artifact)
+    except OSError:
+        pass  # 캐시를 못 쓰는 환경이면 메모리에서만 사용
+
+
+class RulesetRegistry:
+    """규칙 팩 하나의 현재 규칙 세트
+
+    팩 파일이 바뀌면 새 규칙 세트로 교체한다. 교체는 참조 하나를 바꾸는 것뿐이라,
+    이미 이전 규칙 세트를 받아 간 분석은 영향 없이 끝까지 진행된다.
+    """
+
+    def __init__(self, path, cache_dir=CACHE_DIR, check_seconds=RELOAD_CHECK_SECONDS):
+        self.path = path
+        self.cache_dir = cache_dir
+        self.check_seconds = check_seconds
+        self._ruleset = None
+        self._stamp = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def current(self):
+        """현재 규칙 세트 (check_seconds마다 팩 파일 변경 여부 확인)"""
+        if self._ruleset is None or time.monotonic() - self._checked_at >= self.check_seconds:
+            try:
+                self.reload()
+            except (OSError, ValueError, KeyError):
+                # 수정 중인 팩 파일을 읽지 못하면 기존 규칙 세트로 계속 서비스
+                if self._ruleset is None:
+                    raise
+        return self._ruleset
+
+    def reload(self, force=False):
+        """팩 파일이 바뀌었으면 다시 읽어 교체"""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            stat = os.stat(self.path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if force or self._ruleset is None or stamp != self._stamp:
+                ruleset = compile_rule_pack(self.path, self.cache_dir)
+                if self._ruleset is None or ruleset.content_hash != self._ruleset.content_hash:
+                    self._ruleset = ruleset
+                self._stamp = stamp
+            return self._ruleset
+
+
+_default_registry = RulesetRegistry(DEFAULT_RULE_PACK)
+
+# 기본 팩 외에 읽은 규칙 팩 (경로 → 레지스트리, 이전 버전 팩과 나란히 평가할 때)
+_registries = {os.path.abspath(DEFAULT_RULE_PACK): _default_registry}
+_registries_lock = threading.Lock()
+
+
+def get_ruleset(path=None):
+    """규칙 세트 (path가 없으면 기본 규칙 팩) - 팩마다 프로세스에서 한 번 읽고, 팩 파일이 바뀔 때만 교체"""
+    if path is None:
+        return _default_registry.current()
+    key = os.path.abspath(path)
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = _registries[key] = RulesetRegistry(key)
+    return registry.current()
+
+
+def reload_ruleset():
+    """기본 규칙 팩을 지금 다시 읽기"""
+    return _default_registry.reload(force=True)
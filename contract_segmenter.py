@@ -0,0 +1,222 @@
+"""
+계약서 구조 분석 (제N조 / 항 / 호)
+본문을 한 번 훑어 조항 트리와 글자 위치를 만들고,
+키워드 검색 결과를 조항별로 나눠 담는다
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+
+from amount_extractor import amounts_near
+
+# 조 머리글: "제3조【성공보수】", "제 3 조 (성공보수)", "제3조의2 ..." (줄 첫머리만)
+ARTICLE_HEADER = re.compile(
+    r"^[ \t]*제[ \t]*(\d+)[ \t]*조(?:의[ \t]*\d+)?[ \t]*"
+    r"(?:【([^】\n]*)】|\[([^\]\n]*)\]|\(([^)\n]*)\))?",
+    re.M
+)
+
+# 하위 항목: ① (항), 1. / 1) (호), 가. / 가) (목)
+ITEM_MARK = re.compile(
+    r"^[ \t]*(?:([①-⑳])|(\d{1,2})[.)](?=\s)|([가나다라마바사아자차카타파하])[.)](?=\s))",
+    re.M
+)
+
+ITEM_LEVEL = {"항": 1, "호": 2, "목": 3}
+
+# 문장 끝 표시 (계약서 문장은 거의 "~다."로 끝남) - 키워드와 함께 찾아 두고 위치만 씀
+# 조/항/호/목의 시작도 문장 경계로 본다 (마침표 없는 "1. 민사소송 1심" 같은 항목)
+SENTENCE_ENDS = ("다.", "요.")
+
+
+class Segment:
+    """조항 구간 (start~end는 원문 글자 위치)"""
+
+    __slots__ = ("kind", "number", "title", "start", "end", "children")
+
+    def __init__(self, kind, number, title, start, end):
+        self.kind = kind        # 전문 / 조 / 항 / 호 / 목
+        self.number = number
+        self.title = title
+        self.start = start
+        self.end = end
+        self.children = []
+
+    @property
+    def label(self):
+        if self.kind == "전문":
+            return "전문"
+        if self.kind == "조":
+            return f"제{self.number}조" + (f"【{self.title}】" if self.title else "")
+        return self.number
+
+    def to_dict(self):
+        return {
+            "kind": self.kind,
+            "number": self.number,
+            "title": self.title,
+            "label": self.label,
+            "start": self.start,
+            "end": self.end,
+            "children": [child.to_dict() for child in self.children]
+        }
+
+
+def article_from_header(match, base=0, end=None):
+    """조 머리글 매치로 조 구간 생성 (끝 위치는 다음 조를 만나면 정해짐)"""
+    title = match.group(2) or match.group(3) or match.group(4)
+    start = base + match.start()
+    return Segment("조", int(match.group(1)), title.strip() if title else None, start, end or start)
+
+
+def segment_articles(text):
+    """본문을 조 단위로 나누고 각 조의 항/호/목 트리를 구성
+
+    첫 조 앞부분은 "전문"으로 두므로 모든 글자 위치는 반드시 한 구간에 속한다.
+    """
+    articles = []
+    for match in ARTICLE_HEADER.finditer(text):
+        if articles:
+            articles[-1].end = match.start()
+        articles.append(article_from_header(match, end=len(text)))
+
+    if not articles or articles[0].start > 0:
+        end = articles[0].start if articles else len(text)
+        articles.insert(0, Segment("전문", 0, None, 0, end))
+
+    for article in articles:
+        attach_items(text, article)
+    return articles
+
+
+def attach_items(text, article, base=0):
+    """조 안의 항/호/목 표시를 찾아 트리로 연결 (text[0]이 원문의 base 위치)"""
+    stack = [(0, article)]
+    for match in ITEM_MARK.finditer(text, article.start - base, article.end - base):
+        if match.group(1):
+            kind, number = "항", match.group(1)
+        elif match.group(2):
+            kind, number = "호", match.group(2) + "."
+        else:
+            kind, number = "목", match.group(3) + "."
+        level = ITEM_LEVEL[kind]
+        start = base + match.start()
+
+        # 같은 수준 이상의 열린 항목은 여기서 닫힘
+        while stack[-1][0] >= level:
+            stack.pop()[1].end = start
+
+        item = Segment(kind, number, None, start, article.end)
+        stack[-1][1].children.append(item)
+        stack.append((level, item))
+
+
+class ContractIndex:
+    """조항 트리 + 키워드 위치 색인 (분석 1회당 한 번 만들어 모든 규칙이 공유)"""
+
+    def __init__(self, text_length, articles, hits, gap_keywords=(), amounts=None):
+        self.text_length = text_length
+        self.amounts = amounts or {}    # 키워드 위치 (start, end) → 같은 줄 앞뒤의 금액 [Amount, ...]
+        self.articles = articles
+        self._starts = [article.start for article in articles]
+        self._breaks = None     # 문장 경계 위치 (근접 조건을 처음 평가할 때 만듦)
+
+        # 간격 키워드는 같은 조 안에서만 인정
+        for keyword in gap_keywords:
+            if keyword in hits:
+                spans = [(s, e) for s, e in hits[keyword] if self.article_at(s) == self.article_at(e - 1)]
+                if spans:
+                    hits[keyword] = spans
+                else:
+                    del hits[keyword]
+        self.hits = hits
+
+        # 조별 키워드 색인
+        self.article_hits = [{} for _ in articles]
+        for keyword, spans in hits.items():
+            for start, end in spans:
+                self.article_hits[self.article_at(start)].setdefault(keyword, []).append((start, end))
+
+    @classmethod
+    def build(cls, text, matcher, amount_keywords=()):
+        """본문 1회 스캔으로 색인 생성 (amount_keywords 앞뒤의 금액은 그 키워드 주변만 읽음)"""
+        hits = matcher.find_all(text)
+        return cls(
+            len(text),
+            segment_articles(text),
+            hits,
+            [pattern.keyword for pattern in matcher.gap_patterns],
+            amounts_near(text, [span for keyword in amount_keywords for span in hits.get(keyword, ())])
+        )
+
+    def article_at(self, offset):
+        """글자 위치가 속한 조 번호(목록 순서)"""
+        return max(0, bisect_right(self._starts, offset) - 1)
+
+    def has_any(self, keywords, scope=None):
+        """scope(조 순서 튜플) 안에 키워드가 하나라도 있는지 (None이면 문서 전체)"""
+        if scope is None:
+            return any(keyword in self.hits for keyword in keywords)
+        return any(keyword in self.article_hits[i] for i in scope for keyword in keywords)
+
+    def spans(self, keywords, scope=None):
+        """scope 안의 키워드 위치 [(start, end, keyword), ...] (위치 순)"""
+        sources = [self.hits] if scope is None else [self.article_hits[i] for i in scope]
+        found = [(start, end, keyword)
+                 for hits in sources for keyword in keywords
+                 for start, end in hits.get(keyword, ())]
+        return sorted(set(found))
+
+    def amounts_for(self, spans, unit="원", before=False):
+        """키워드 위치들 뒤(before=True면 앞뒤)에 나온 금액 목록"""
+        return [amount for start, end, _ in spans for amount in self.amounts.get((start, end), ())
+                if amount.unit == unit and (before or amount.start >= end)]
+
+    def nearest_amount(self, span, unit="원", before=False):
+        """키워드 위치 바로 뒤(before=True면 앞뒤 중 가까운 쪽)의 금액 하나 (없으면 None)"""
+        start, end, _ = span
+        amounts = self.amounts_for([span], unit, before)
+        if not amounts:
+            return None
+        return min(amounts, key=lambda amount: amount.start - end if amount.start >= end else start - amount.end)
+
+    def sentence_at(self, offset):
+        """글자 위치가 속한 문장 구간 (start, end) - 문장 끝 표시와 조/항/호/목 시작으로 나눔"""
+        if self._breaks is None:
+            breaks = {end for keyword in SENTENCE_ENDS for _, end in self.hits.get(keyword, ())}
+            stack = list(self.articles)
+            while stack:
+                segment = stack.pop()
+                breaks.add(segment.start)
+                stack += segment.children
+            self._breaks = sorted(breaks)
+        i = bisect_right(self._breaks, offset)
+        start = self._breaks[i - 1] if i else 0
+        end = self._breaks[i] if i < len(self._breaks) else self.text_length
+        return start, end
+
+    def near(self, spans, keywords, within="sentence", scope=None):
+        """위치마다 근처(같은 문장, 또는 앞뒤 within 글자 안)에 있는 keywords 위치 목록
+
+        keywords 위치는 정렬된 배열에서 이분 탐색으로 찾는다 (본문을 다시 읽지 않음).
+        → [[(start, end, keyword), ...], ...] (spans와 같은 순서)
+        """
+        targets = self.spans(keywords, scope)
+        starts = [start for start, _, _ in targets]
+        found = []
+        for start, end, _ in spans:
+            if within == "sentence":
+                low, high = self.sentence_at(start)
+            else:
+                low, high = start - within, end + within
+            near = []
+            for i in range(bisect_left(starts, low), bisect_left(starts, high)):
+                if targets[i][1] <= high:
+                    near.append(targets[i])
+            found.append(near)
+        return found
+
+    def articles_with(self, keywords):
+        """키워드가 나오는 조 순서 목록"""
+        return [i for i, found in enumerate(self.article_hits)
+                if any(keyword in found for keyword in keywords)]
@@ -0,0 +1,222 @@
+"""
+규칙 팩 나란히 평가 (섀도 테스트)
+여러 규칙 팩(예: conga_v5와 이전 v4 엔진의 conga_v4)의 키워드를 매칭 엔진 하나로 합쳐 본문을 한 번만 훑고,
+같은 색인으로 팩마다 규칙을 평가한 뒤 판정 차이(위험 패턴, 조항, 점수)를 비교한다.
+새 규칙 버전을 실제 요청에 몰래 돌려 볼 때도 본문을 두 번 읽지 않는다
+
+실행:
+    python contract_shadow.py 계약서폴더/ -o shadow.jsonl
+    python contract_shadow.py contracts.zip --base rules/conga_v5.json --pack rules/conga_v4.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import Counter, OrderedDict
+
+from contract_analyzer import analyze_index
+from contract_ruleset import DEFAULT_RULE_PACK, RULES_DIR, get_ruleset
+from contract_segmenter import ContractIndex
+from keyword_matcher import KeywordMatcher
+
+# 기본으로 비교할 이전 버전 규칙 팩
+PREVIOUS_RULE_PACK = os.path.join(RULES_DIR, "conga_v4.json")
+
+# 실제 요청에 함께 돌려 볼 규칙 팩 (API 서버, 지정하지 않으면 끔) / 판정 차이 기록 파일
+SHADOW_RULE_PACK = os.environ.get("CONGA_SHADOW_PACK")
+SHADOW_LOG = os.environ.get("CONGA_SHADOW_LOG", "shadow.jsonl")
+
+# 만들어 둔 묶음 수 (규칙 세트 조합마다 매칭 엔진을 한 번 컴파일)
+MAX_GROUPS = 4
+
+
+class RulesetGroup:
+    """한 번의 매칭으로 평가할 규칙 세트 묶음
+
+    모든 규칙 세트의 키워드를 매칭 엔진 하나에 넣어 두므로, 본문을 한 번 훑어 만든 색인으로
+    각 규칙 세트를 따로 평가할 수 있다. 결과는 규칙 세트마다 analyze_contract()를 부른 것과 같다.
+    """
+
+    __slots__ = ("rulesets", "matcher", "amount_keywords")
+
+    def __init__(self, rulesets):
+        keywords = []
+        amount_keywords = set()
+        for ruleset in rulesets:
+            matcher = ruleset.matcher
+            keywords += [name for names in matcher.names for name in names]
+            keywords += [pattern.keyword for pattern in matcher.gap_patterns]
+            amount_keywords.update(ruleset.amount_keywords)
+        self.rulesets = tuple(rulesets)
+        self.matcher = KeywordMatcher(keywords)
+        self.amount_keywords = frozenset(amount_keywords)
+
+    def analyze(self, text):
+        """본문 한 번 훑기 → 규칙 세트 순서대로 [ContractResult, ...]"""
+        index = ContractIndex.build(text, self.matcher, self.amount_keywords)
+        return [analyze_index(ruleset, index) for ruleset in self.rulesets]
+
+
+# 규칙 세트 내용 해시 조합 → 묶음 (팩이 바뀌면 새 조합이 되고 오래된 묶음은 밀려남)
+_groups = OrderedDict()
+_groups_lock = threading.Lock()
+
+
+def group_for(rulesets):
+    """규칙 세트 묶음 (같은 조합은 매칭 엔진을 다시 만들지 않음)"""
+    key = tuple(ruleset.content_hash for ruleset in rulesets)
+    with _groups_lock:
+        group = _groups.get(key)
+        if group is not None:
+            _groups.move_to_end(key)
+            return group
+    group = RulesetGroup(rulesets)
+    with _groups_lock:
+        _groups[key] = group
+        while len(_groups) > MAX_GROUPS:
+            _groups.popitem(last=False)
+    return group
+
+
+def analyze_side_by_side(rulesets, text):
+    """여러 규칙 세트로 본문 분석 (매칭 1회) → [ContractResult, ...]"""
+    return group_for(rulesets).analyze(text)
+
+
+def diff_results(base, other):
+    """두 규칙 세트의 판정 차이 (other가 base와 어떻게 다른지)
+
+    한쪽 팩에만 있는 규칙은 추가/제거로 나오고, 조항은 두 팩에 모두 있는 것만 비교한다.
+    """
+    base_risks = {risk.name for risk in base.risks}
+    other_risks = {risk.name for risk in other.risks}
+    base_clauses = {clause.name: clause for clause in base.clauses}
+    clauses_changed = []
+    specificity_changed = []
+    for clause in other.clauses:
+        before = base_clauses.get(clause.name)
+        if before is None:
+            continue
+        if before.found != clause.found:
+            clauses_changed.append(clause.name)
+        if before.specificity != clause.specificity:
+            specificity_changed.append(clause.name)
+
+    diff = {
+        "base": base.ruleset.label,
+        "other": other.ruleset.label,
+        "score": [base.score, other.score],
+        "score_delta": other.score - base.score,
+        "risks_added": [risk.name for risk in other.risks if risk.name not in base_risks],
+        "risks_removed": [risk.name for risk in base.risks if risk.name not in other_risks],
+        "clauses_changed": clauses_changed,
+        "specificity_changed": specificity_changed,
+    }
+    diff["same"] = not (diff["score_delta"] or diff["risks_added"] or diff["risks_removed"]
+                        or clauses_changed or specificity_changed)
+    return diff
+
+
+def compare(rulesets, text):
+    """첫 규칙 세트를 기준으로 나머지와의 판정 차이 → (기준 결과, [차이, ...])"""
+    results = analyze_side_by_side(rulesets, text)
+    return results[0], [diff_results(results[0], other) for other in results[1:]]
+
+
+def record_diff(diff, path=SHADOW_LOG):
+    """판정 차이를 기록 파일에 한 줄 추가 (여러 프로세스가 함께 써도 줄이 섞이지 않게 한 번에 씀)"""
+    line = (json.dumps(diff, ensure_ascii=False) + "\n").encode("utf-8")
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass  # 기록을 못 해도 본 분석 결과에는 영향 없음
+
+
+class DiffSummary:
+    """여러 계약서의 판정 차이 집계 (비교 대상 팩별)"""
+
+    def __init__(self):
+        self.contracts = 0
+        self.changed = Counter()
+        self.score_deltas = {}
+        self.risks_added = {}
+        self.risks_removed = {}
+
+    def add(self, diffs):
+        self.contracts += 1
+        for diff in diffs:
+            other = diff["other"]
+            self.changed[other] += not diff["same"]
+            self.score_deltas.setdefault(other, []).append(diff["score_delta"])
+            self.risks_added.setdefault(other, Counter()).update(diff["risks_added"])
+            self.risks_removed.setdefault(other, Counter()).update(diff["risks_removed"])
+
+    def lines(self, base):
+        """사람이 읽는 요약 줄 목록"""
+        lines = []
+        for other, deltas in self.score_deltas.items():
+            mean = sum(deltas) / len(deltas)
+            lines.append(f"{other} (기준 {base}): {self.changed[other]}/{self.contracts}건 판정 다름, "
+                         f"점수 차이 평균 {mean:+.1f} (최소 {min(deltas):+d}, 최대 {max(deltas):+d})")
+            for label, counter in (("추가", self.risks_added[other]), ("제거", self.risks_removed[other])):
+                if counter:
+                    top = ", ".join(f"{name} {count}건" for name, count in counter.most_common(5))
+                    lines.append(f"  위험 패턴 {label}: {top}")
+        return lines
+
+
+def _read_text(kind, data):
+    from contract_batch import decode_text
+    if kind == "pdf":
+        from pdf_extractor import extract_pdf
+        return extract_pdf(data, workers=1).text
+    return decode_text(data)
+
+
+def run(paths, output, base_pack, packs):
+    """파일마다 기준 팩과 비교 팩들의 판정 차이를 JSON 한 줄씩 출력 → DiffSummary"""
+    from batch_cli import iter_files
+    rulesets = [get_ruleset(base_pack)] + [get_ruleset(pack) for pack in packs]
+    summary = DiffSummary()
+    for name, kind, data in iter_files(paths):
+        line = {"file": name, "sha256": hashlib.sha256(data).hexdigest()}
+        try:
+            results, diffs = compare(rulesets, _read_text(kind, data))
+        except Exception as e:
+            line["error"] = f"{type(e).__name__}: {e}"
+        else:
+            line.update(base=results.ruleset.label, score=results.score, diffs=diffs)
+            summary.add(diffs)
+        output.write(json.dumps(line, ensure_ascii=False) + "\n")
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="규칙 팩 판정 비교 (본문은 파일마다 한 번만 훑음)")
+    parser.add_argument("inputs", nargs="+", help="PDF/TXT 파일, 폴더, zip/tar 압축 파일")
+    parser.add_argument("-o", "--output", help="결과 JSONL 경로 (기본: 표준 출력)")
+    parser.add_argument("--base", default=DEFAULT_RULE_PACK, help="기준 규칙 팩 (기본: 현재 규칙 팩)")
+    parser.add_argument("--pack", action="append", help=f"비교할 규칙 팩 (여러 번 지정 가능, 기본: {PREVIOUS_RULE_PACK})")
+    args = parser.parse_args(argv)
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        summary = run(args.inputs, output, args.base, args.pack or [PREVIOUS_RULE_PACK])
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    for line in summary.lines(get_ruleset(args.base).label):
+        print(line, file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""
+조각 단위(스트리밍) 계약서 분석
+PDF 페이지나 입력창 텍스트를 조각마다 feed()로 넘기면,
+키워드 매칭 상태를 조각 경계 너머로 이어 가면서 확정된 결과부터 바로 알려준다
+"""
+
+from amount_extractor import amounts_near
+from contract_analyzer import analyze_index, check_risk_pattern
+from contract_ruleset import get_ruleset
+from text_normalizer import open_cluster
+from contract_segmenter import (
+    ARTICLE_HEADER,
+    ContractIndex,
+    Segment,
+    article_from_header,
+    attach_items,
+)
+
+
+class StreamingAnalyzer:
+    """조각 단위 분석기 (본문 전체를 메모리에 모으지 않음)
+
+    feed(chunk)는 새로 확정된 결과 목록을 반환하고, close()는 최종 분석 결과를 반환한다.
+    최종 결과는 같은 본문을 analyze_contract()로 한 번에 분석한 것과 같다.
+    """
+
+    def __init__(self, ruleset=None):
+        self.ruleset = ruleset or get_ruleset()
+        self.text_length = 0
+        self.results = None
+
+        self._state = 0             # 키워드 매칭 상태 (조각 경계를 넘어 유지, scan()이 돌려준 값)
+        self._unscanned = ""        # 다음 조각과 합쳐질 수 있어 아직 훑지 않은 끝 글자
+        self._matches = []
+        self._open_matches = []     # 아직 닫히지 않은 조의 매치
+        self._tail = ""             # 아직 줄바꿈이 오지 않은 마지막 줄
+        self._tail_start = 0
+        self._articles = []
+        self._current = None        # 열려 있는 조
+        self._article_text = []     # 열린 조의 본문 (조가 닫히면 버림)
+        self._confirmed = set()
+        self._amount_keywords = self.ruleset.amount_keywords
+        self._amount_matches = []   # 금액을 아직 읽지 않은 금액 확인 키워드 위치 (줄이 끝나면 읽음)
+        self._amounts = {}
+
+        # 키워드 → 해당 키워드로 바로 확정되는 항목
+        self._instant = {}
+        for name, clause_data in self.ruleset.required_clauses.items():
+            for keyword in clause_data["keywords"]:
+                self._instant.setdefault(keyword, []).append(("required", name))
+        for name, pattern_data in self.ruleset.risk_patterns.items():
+            if self._is_unconditional(pattern_data):
+                for keyword in pattern_data["keywords"]:
+                    self._instant.setdefault(keyword, []).append(("risk", name))
+
+    @staticmethod
+    def _is_unconditional(pattern_data):
+        """키워드만 나오면 위험으로 확정되는 패턴인지"""
+        return (pattern_data.get("scope") != "article"
+                and not pattern_data.get("check_for_vague", False)
+                and not pattern_data.get("check_amount", False)
+                and not pattern_data.get("anti_keywords")
+                and not pattern_data.get("near"))
+
+    @staticmethod
+    def _is_per_article(pattern_data):
+        """조 하나가 끝나면 판정이 확정되는 패턴인지"""
+        return pattern_data.get("scope") == "article" and not pattern_data.get("section_titles")
+
+    def feed(self, chunk):
+        """본문 조각을 추가하고 새로 확정된 결과 목록을 반환"""
+        if self.results is not None:
+            raise RuntimeError("이미 close()된 분석기입니다")
+        if not chunk:
+            return []
+
+        # 조각 끝 글자는 다음 조각의 결합 문자(풀어 쓴 자모 등)와 함께 훑음
+        text = self._unscanned + chunk
+        keep = open_cluster(text)
+        matches = self._scan(text[:len(text) - keep], self.text_length - len(self._unscanned))
+        self._unscanned = text[len(text) - keep:]
+        self.text_length += len(chunk)
+
+        matcher = self.ruleset.matcher
+        events = []
+        for start, end, index in matches:
+            names = matcher.names[index]
+            if not self._amount_keywords.isdisjoint(names):
+                self._amount_matches.append((start, end))
+            for keyword in names:
+                for kind, name in self._instant.get(keyword, ()):
+                    events += self._confirm(kind, name, [(start, end, keyword)])
+
+        # 완성된 줄까지만 조 구분 (조 머리글은 줄 첫머리에만 옴)
+        buffer = self._tail + chunk
+        cut = buffer.rfind("\n") + 1
+        if cut:
+            events += self._process_lines(buffer[:cut], self._tail_start)
+            self._tail_start += cut
+            buffer = buffer[cut:]
+        self._tail = buffer
+        return events
+
+    def close(self):
+        """남은 본문을 마무리하고 최종 분석 결과를 반환"""
+        if self.results is not None:
+            return self.results
+
+        self._scan(self._unscanned, self.text_length - len(self._unscanned))
+        self._unscanned = ""
+        if self._tail:
+            self._process_lines(self._tail, self._tail_start)
+            self._tail = ""
+        if self._current is None:
+            self._open(Segment("전문", 0, None, 0, 0))
+        self._close_article(self.text_length)
+
+        matcher = self.ruleset.matcher
+        index = ContractIndex(
+            self.text_length,
+            self._articles,
+            matcher.collect(self._matches),
+            [pattern.keyword for pattern in matcher.gap_patterns],
+            self._amounts
+        )
+        self.results = analyze_index(self.ruleset, index)
+        self._matches = []
+        self._amounts = {}
+        return self.results
+
+    def _scan(self, text, offset):
+        matches, self._state = self.ruleset.matcher.scan(text, self._state, offset)
+        self._matches += matches
+        self._open_matches += matches
+        return matches
+
+    def _process_lines(self, block, base):
+        """완성된 줄 묶음에서 조 머리글을 찾아 조를 열고 닫음"""
+        # 금액 확인 키워드 뒤의 금액 (금액은 줄을 넘지 않으므로 줄이 끝난 키워드만)
+        if self._amount_matches:
+            block_end = base + len(block)
+            ready = [span for span in self._amount_matches if span[1] <= block_end]
+            self._amount_matches = [span for span in self._amount_matches if span[1] > block_end]
+            self._amounts.update(amounts_near(block, ready, base))
+
+        events = []
+        pos = 0
+        for match in ARTICLE_HEADER.finditer(block):
+            start = base + match.start()
+            if self._current is None and start > 0:
+                self._open(Segment("전문", 0, None, 0, 0))
+            if self._current is not None:
+                self._article_text.append(block[pos:match.start()])
+                events += self._close_article(start)
+            self._open(article_from_header(match, base))
+            pos = match.start()
+        if self._current is None:
+            self._open(Segment("전문", 0, None, 0, 0))
+        self._article_text.append(block[pos:])
+        return events
+
+    def _open(self, article):
+        self._current = article
+        self._article_text = []
+
+    def _close_article(self, end):
+        """조 하나를 닫고, 그 조만 보고 판정할 수 있는 위험 패턴을 확정"""
+        article = self._current
+        article.end = end
+        attach_items("".join(self._article_text), article, base=article.start)
+        self._articles.append(article)
+        self._current = None
+        self._article_text = []
+
+        inside = [m for m in self._open_matches if m[0] < end]
+        self._open_matches = [m for m in self._open_matches if m[0] >= end]
+
+        events = []
+        if not inside:
+            return events
+        local = ContractIndex(end, [article], self.ruleset.matcher.collect(inside),
+                              [pattern.keyword for pattern in self.ruleset.matcher.gap_patterns],
+                              self._amounts)
+        for name, pattern_data in self.ruleset.risk_patterns.items():
+            if self._is_per_article(pattern_data):
+                spans = check_risk_pattern(local, pattern_data)
+                if spans is not None:
+                    events += self._confirm("risk", name, spans)
+        return events
+
+    def _confirm(self, kind, name, spans):
+        """처음 확정된 항목만 결과로 알림"""
+        if (kind, name) in self._confirmed:
+            return []
+        self._confirmed.add((kind, name))
+        return [{"type": kind, "name": name, "spans": spans}]
@@ -0,0 +1,164 @@
+"""
+백그라운드 분석 작업
+추출과 분석을 화면 스레드 밖에서 돌리고, 쪽/단계별 진행 상황을 알려준다.
+사용자가 취소하거나 제한 시간이 지나면 그때까지 읽은 부분만으로 분석한 결과를 돌려준다
+(PDF 추출 프로세스는 그 자리에서 끝내므로 멈춘 작업이 작업 자리를 계속 차지하지 않음)
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from contract_analyzer import analyze_contract
+from contract_ruleset import get_ruleset
+from contract_stream import StreamingAnalyzer
+from ocr_extractor import ocr_images
+from pdf_extractor import extract_pdf
+from upload_ingest import track_memory
+
+# 동시에 돌 수 있는 분석 작업 수 (넘치면 대기)
+MAX_JOBS = int(os.environ.get("CONGA_MAX_JOBS", "4"))
+
+# 요청 하나의 기본 제한 시간 (초)
+DEFAULT_DEADLINE_SECONDS = 90
+
+_executor = ThreadPoolExecutor(max_workers=MAX_JOBS, thread_name_prefix="conga-analysis")
+
+
+class AnalysisJob:
+    """분석 작업 하나 (화면 쪽에서는 progress()로 진행 상황을 읽고, result()로 결과를 받음)
+
+    결과의 partial이 None이 아니면 본문 일부만 분석한 것이다:
+    {"reason": "cancelled" | "deadline" | "page_limit", "done": 읽은 쪽(조각) 수, "total": 전체 쪽(조각) 수}
+    """
+
+    def __init__(self, kind, content, ruleset=None, deadline_seconds=DEFAULT_DEADLINE_SECONDS,
+                 incremental=None, max_pages=None, on_finish=None):
+        self.kind = kind                    # "text" / "pdf" / "image"
+        self.ruleset = ruleset or get_ruleset()
+        self.started = time.monotonic()
+        self.deadline = self.started + deadline_seconds
+        self.stage = "대기"
+        self.done = 0
+        self.total = 0
+        self.confirmed = 0                  # 읽는 도중 확정된 항목 수
+        self.text_length = 0
+
+        self._content = content
+        self._incremental = incremental
+        self._max_pages = max_pages
+        self._on_finish = on_finish
+        self._cancel = threading.Event()
+        self._finished = threading.Event()
+        self._results = None
+        self._error = None
+        self._future = _executor.submit(self._run)
+
+    # 화면 스레드에서 호출
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def expired(self):
+        return time.monotonic() > self.deadline
+
+    def progress(self):
+        """(0~1 진행률, 안내 문구)"""
+        if self.stage == "읽기" and self.total:
+            unit = "페이지" if self.kind == "pdf" else "조각"
+            return (0.1 + 0.7 * self.done / self.total,
+                    f"📄 {self.done}/{self.total} {unit} 읽는 중... (확인된 항목 {self.confirmed}개)")
+        if self.stage == "분석":
+            return 0.9, "🔍 계약서를 꼼꼼히 분석하고 있습니다..."
+        if self.stage == "완료":
+            return 1.0, "✅ 분석 완료!"
+        return 0.05, "📄 계약서 내용을 읽고 있습니다..."
+
+    def wait(self, timeout):
+        """작업이 끝났거나 더 기다릴 필요가 없으면 True"""
+        if self._finished.wait(timeout):
+            return True
+        return self.cancelled or self.expired()
+
+    def result(self):
+        """분석 결과 (취소/시간 제한으로 멈췄으면 그때까지 읽은 부분으로 분석한 결과)
+
+        멈출 때는 추출 프로세스를 바로 끝내고 읽은 조각은 이미 분석기에 넘어가 있으므로 오래 기다리지 않는다.
+        아직 작업 자리를 기다리던 작업이면 여기서 바로 (빈) 부분 결과를 만든다.
+        작업 중 오류는 여기서 다시 발생한다.
+        """
+        if (self.cancelled or self.expired()) and self._future.cancel():
+            self._run()
+        self._finished.wait()
+        if self._error is not None:
+            raise self._error
+        return self._results
+
+    # 작업 스레드
+
+    def _should_stop(self):
+        return self._cancel.is_set() or self.expired()
+
+    def _run(self):
+        try:
+            with track_memory(self.kind):
+                if self.kind == "text":
+                    self._results = self._run_text()
+                else:
+                    self._results = self._run_stream()
+            self.stage = "완료"
+        except Exception as e:
+            self._error = e
+        finally:
+            self._content = None
+            if self._on_finish is not None:
+                self._on_finish()
+            self._finished.set()
+
+    def _run_text(self):
+        self.stage = "분석"
+        self.text_length = len(self._content)
+        if self._incremental is not None:
+            return self._incremental.analyze(self._content)
+        return analyze_contract(self.ruleset, self._content)
+
+    def _run_stream(self):
+        stream = StreamingAnalyzer(self.ruleset)
+        self.stage = "읽기"
+
+        # 조각은 분석기에 바로 넘기고 보관하지 않음 (본문 전체를 메모리에 모으지 않음)
+        def on_piece(number, total, piece):
+            self.confirmed += len(stream.feed(piece))
+            self.done, self.total = number, total
+
+        if self.kind == "pdf":
+            document = extract_pdf(self._content, max_pages=self._max_pages, keep_text=False,
+                                   on_page=on_piece, should_stop=self._should_stop)
+            self.total = document.total_pages
+        else:
+            ocr_images([self._content], on_tile=on_piece, should_stop=self._should_stop)
+
+        self.stage = "분석"
+        self.text_length = stream.text_length
+        results = stream.close()
+        if self.kind == "pdf":
+            results.pages = document.page_ranges()
+            if document.truncated:
+                limited = self._max_pages and self.done >= self._max_pages
+                results.partial = self._partial_info(self.done, "page_limit" if limited else None)
+        elif self.total == 0 or self.done < self.total:
+            if self._should_stop():
+                results.partial = self._partial_info(self.done)
+        return results
+
+    def _partial_info(self, done, reason=None):
+        return {
+            "reason": reason or ("cancelled" if self.cancelled else "deadline"),
+            "done": done,
+            "total": self.total,
+        }
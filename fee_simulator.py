@@ -0,0 +1,110 @@
+"""
+보수 / 환불 시뮬레이션
+계약서에서 읽은 보수 조건(착수금, 성공보수, 시간당 보수)으로
+승소 비율 × 해지 시점 × 투입 시간의 여러 경우를 NumPy 배열로 한 번에 계산한다.
+격자 전체를 계산해도 수 ms라서 화면의 슬라이더를 움직일 때마다 다시 그려도 된다
+"""
+
+import numpy as np
+
+# 격자 크기 (승소 비율 0~100%, 해지 시점 = 사건 진행률 0~100%, 총 투입 시간 0~max_hours)
+WIN_STEPS = 101
+PROGRESS_STEPS = 101
+HOURS_STEPS = 61
+
+# 총 투입 시간 기본 상한 (시간)
+DEFAULT_MAX_HOURS = 300
+
+
+class FeeScenarios:
+    """경우별 보수 / 환불액 (원)
+
+    win_ratios, progress, hours: 각 축의 값 (승소 비율 0~1, 해지 시점 0~1, 총 투입 시간)
+    judgment: 판결로 끝날 때 총 보수 [승소 비율, 총 투입 시간]
+    settlement: 화해로 끝날 때 총 보수 [화해 금액 비율, 총 투입 시간]
+    refund: 중도 해지 시 돌려받는 금액 [해지 시점, 총 투입 시간]
+    paid_on_termination: 중도 해지 시 내는 총 보수 [해지 시점, 총 투입 시간]
+    """
+
+    __slots__ = ("win_ratios", "progress", "hours", "judgment", "settlement", "refund", "paid_on_termination")
+
+    def __init__(self, win_ratios, progress, hours, judgment, settlement, refund, paid_on_termination):
+        self.win_ratios = win_ratios
+        self.progress = progress
+        self.hours = hours
+        self.judgment = judgment
+        self.settlement = settlement
+        self.refund = refund
+        self.paid_on_termination = paid_on_termination
+
+    @property
+    def count(self):
+        """계산한 경우의 수"""
+        return self.judgment.size + self.settlement.size + self.refund.size
+
+    @staticmethod
+    def _nearest(axis, value):
+        return int(np.abs(axis - value).argmin())
+
+    def fee_curve(self, hours):
+        """총 투입 시간을 정했을 때 승소 비율별 (판결 보수, 화해 보수)"""
+        h = self._nearest(self.hours, hours)
+        return self.judgment[:, h], self.settlement[:, h]
+
+    def refund_curve(self, hours):
+        """총 투입 시간을 정했을 때 해지 시점별 (환불액, 낸 보수)"""
+        h = self._nearest(self.hours, hours)
+        return self.refund[:, h], self.paid_on_termination[:, h]
+
+    def at(self, win_ratio, progress, hours):
+        """한 경우의 값 {"judgment", "settlement", "refund", "paid_on_termination"} (가장 가까운 격자점)"""
+        w = self._nearest(self.win_ratios, win_ratio)
+        p = self._nearest(self.progress, progress)
+        h = self._nearest(self.hours, hours)
+        return {
+            "judgment": int(self.judgment[w, h]),
+            "settlement": int(self.settlement[w, h]),
+            "refund": int(self.refund[p, h]),
+            "paid_on_termination": int(self.paid_on_termination[p, h]),
+        }
+
+
+def simulate(fees, claim_amount=0, max_hours=DEFAULT_MAX_HOURS, success_on_settlement=True,
+             win_steps=WIN_STEPS, progress_steps=PROGRESS_STEPS, hours_steps=HOURS_STEPS):
+    """보수 조건으로 모든 경우를 한 번에 계산 → FeeScenarios
+
+    fees: {"retainer", "success_rate", "success_amount", "hourly_rate"} (ContractResult.fees 형식, None은 0)
+    claim_amount: 성공보수 비율을 적용할 경제적 이익 (전부 승소 시 금액, 원)
+
+    계산 기준:
+    - 성공보수는 승소(화해) 금액 비율만큼 (비율 조건이면 경제적 이익 × 비율 × 승소 비율)
+    - 중도 해지 시 착수금에서 시간당 보수 × 투입 시간(총 투입 시간 × 해지 시점)을 공제하고 남은 금액을 환불
+    - 착수금 없이 시간당 보수만 있으면 투입 시간만큼 낸다
+    """
+    retainer = fees.get("retainer") or 0
+    hourly_rate = fees.get("hourly_rate") or 0
+
+    win_ratios = np.linspace(0.0, 1.0, win_steps)
+    progress = np.linspace(0.0, 1.0, progress_steps)
+    hours = np.linspace(0.0, max_hours, hours_steps)
+
+    if fees.get("success_rate") is not None:
+        success = claim_amount * fees["success_rate"] / 100 * win_ratios
+    else:
+        success = (fees.get("success_amount") or 0) * win_ratios
+
+    # 착수금이 없는 시간제 계약은 투입 시간만큼이 기본 보수
+    time_fee = np.zeros_like(hours) if retainer else hourly_rate * hours
+    base = retainer + time_fee[None, :]
+    judgment = base + success[:, None]
+    settlement = base + (success if success_on_settlement else np.zeros_like(success))[:, None]
+
+    billed = hourly_rate * progress[:, None] * hours[None, :]
+    if retainer:
+        refund = np.maximum(0.0, retainer - billed)
+        paid_on_termination = retainer - refund
+    else:
+        refund = np.zeros_like(billed)
+        paid_on_termination = billed
+
+    return FeeScenarios(win_ratios, progress, hours, judgment, settlement, refund, paid_on_termination)
@@ -0,0 +1,234 @@
+"""
+다중 키워드 매칭 엔진 (Aho-Corasick)
+규칙에 등장하는 모든 키워드를 한 번에 컴파일해 두고,
+계약서 본문은 한 번만 훑어서 모든 키워드 위치를 찾는다
+
+"A.*B" 형태의 키워드는 정규식으로 본문을 다시 훑지 않고,
+A/B를 일반 키워드로 함께 찾은 뒤 위치만 비교한다 (백트래킹 없음, 선형 시간)
+
+매칭 공간은 정규화되어 있다 (text_normalizer): 공백/줄바꿈은 건너뛰고 전각 글자는 반각 글자로 본다.
+본문을 바꿔 쓰지 않고 전이표로 처리하므로 추가 비용이 없고, 위치는 원문 기준이다
+"""
+
+import re
+from bisect import bisect_right
+
+from text_normalizer import FULLWIDTH_OF, IGNORABLE, canonical_keyword, to_nfc
+
+# "A.*B"에서 A와 B 사이에 허용하는 최대 글자 수
+DEFAULT_MAX_GAP = 30
+
+# 간격 표기: ".*" (기본 간격) 또는 ".{0,N}" (N글자 이내)
+GAP_TOKEN = re.compile(r"\.\*|\.\{0,(\d+)\}")
+
+
+class GapPattern:
+    """간격 키워드 ("계약 후.*시간" = "계약 후" 뒤 N글자 이내에 "시간")"""
+
+    def __init__(self, keyword, parts, gaps):
+        self.keyword = keyword
+        self.parts = tuple(parts)
+        self.gaps = tuple(gaps)
+
+    @classmethod
+    def parse(cls, keyword):
+        """간격 표기가 없으면 None"""
+        parts = []
+        gaps = []
+        pos = 0
+        for token in GAP_TOKEN.finditer(keyword):
+            parts.append(keyword[pos:token.start()])
+            gaps.append(int(token.group(1)) if token.group(1) else DEFAULT_MAX_GAP)
+            pos = token.end()
+        if not gaps:
+            return None
+        parts.append(keyword[pos:])
+        if not all(parts):
+            raise ValueError(f"간격 키워드 앞뒤에 문자열이 필요합니다: {keyword}")
+        return cls(keyword, parts, gaps)
+
+    def match(self, hits):
+        """리터럴 키워드 위치 {keyword: [(start, end), ...]}로부터 전체 패턴 위치 계산"""
+        # (패턴 시작, 현재 조각 끝) - 끝 위치 순으로 정렬되어 있음
+        reachable = list(hits.get(self.parts[0], ()))
+        for part, gap in zip(self.parts[1:], self.gaps):
+            if not reachable:
+                return []
+            ends = [end for _, end in reachable]
+            next_reachable = []
+            for start, end in hits.get(part, ()):
+                # start 이전에 끝난 가장 가까운 앞 조각
+                i = bisect_right(ends, start) - 1
+                if i >= 0 and start - ends[i] <= gap:
+                    next_reachable.append((reachable[i][0], end))
+            reachable = next_reachable
+        return reachable
+
+
+class KeywordMatcher:
+    def __init__(self, keywords):
+        # 간격 키워드는 조각으로 나눠서 리터럴 키워드와 함께 컴파일
+        literals = []
+        self.gap_patterns = []
+        for keyword in dict.fromkeys(k for k in keywords if k):
+            pattern = GapPattern.parse(keyword)
+            if pattern:
+                self.gap_patterns.append(pattern)
+                literals += pattern.parts
+            else:
+                literals.append(keyword)
+
+        # 정규화하면 같아지는 키워드("담당변호사" / "담당 변호사")는 트라이에 한 번만 넣음
+        spellings = {}
+        for literal in dict.fromkeys(literals):
+            spellings.setdefault(canonical_keyword(literal), []).append(literal)
+        spellings.pop("", None)
+
+        # 매칭 공간의 키워드 / 키워드 번호별 규칙 표기들 (찾은 위치는 모든 표기로 알려 줌)
+        self.keywords = tuple(spellings)
+        self.names = tuple(tuple(names) for names in spellings.values())
+        self._lengths = [len(keyword) for keyword in self.keywords]
+        self._max_length = max(self._lengths, default=0)
+
+        # 트라이 구성: 상태별 전이표 / 실패 링크 / 출력(키워드 번호)
+        goto = [{}]
+        fail = [0]
+        self._out = [()]
+
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for ch in keyword:
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][ch] = next_state
+                    goto.append({})
+                    fail.append(0)
+                    self._out.append(())
+                state = next_state
+            self._out[state] = self._out[state] + (index,)
+
+        # 실패 링크 계산 (BFS)
+        queue = list(goto[0].values())
+        for state in queue:
+            for ch, next_state in goto[state].items():
+                queue.append(next_state)
+                link = fail[state]
+                while link and ch not in goto[link]:
+                    link = fail[link]
+                target = goto[link].get(ch, 0)
+                fail[next_state] = target if target != next_state else 0
+                # 실패 링크 쪽에서 끝나는 키워드도 함께 출력
+                self._out[next_state] = self._out[next_state] + self._out[fail[next_state]]
+
+        # 실패 링크를 미리 따라가 둔 전이표 (훑을 때 글자마다 사전 조회 한 번)
+        # 키워드 도중의 공백류는 제자리 ("담당 변호사", 줄이 나뉜 "변호\n사")
+        self._delta = [None] * len(goto)
+        self._delta[0] = dict(goto[0])
+        for state in queue:
+            transitions = dict(self._delta[fail[state]])
+            transitions.update(goto[state])
+            transitions.update(dict.fromkeys(IGNORABLE, state))
+            self._delta[state] = transitions
+
+        # 정규화: 전각 글자는 반각 글자와 같은 곳으로
+        # (실패 링크를 다 만든 뒤에 넣음 - 트라이에 넣으면 BFS가 같은 상태를 여러 번 거쳐 출력이 중복됨)
+        for transitions in self._delta:
+            transitions.update({FULLWIDTH_OF[ch]: next_state for ch, next_state in transitions.items()
+                                if ch in FULLWIDTH_OF})
+
+    def scan(self, text, state=0, offset=0):
+        """본문을 한 번 훑어 [(start, end, keyword_index), ...]와 마지막 상태를 반환
+
+        위치는 원문 기준이다 (공백을 사이에 두거나 전각/NFC가 아닌 글자로 적힌 키워드도).
+        state/offset을 이어서 넘기면 여러 조각으로 나뉜 본문도 이어서 훑을 수 있다.
+        (NFC는 조각별로 맞추므로 조각 끝의 글자는 text_normalizer.open_cluster()만큼 다음 조각에 넘겨야 함)
+        """
+        state, tail = state or (0, ())
+        text, positions = to_nfc(text)
+
+        delta = self._delta
+        out = self._out
+        keywords = self.keywords
+        lengths = self._lengths
+        ignorable = IGNORABLE
+        matches = []
+
+        for i, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            if out[state] and ch not in ignorable:
+                end = i + 1
+                for index in out[state]:
+                    start = end - lengths[index]
+                    if start < 0 or text[start:end] != keywords[index]:
+                        # 사이에 공백이 있거나 전각 글자로 적힌 키워드 (앞 조각에서 시작했으면 음수)
+                        start = _start_of(text, i, lengths[index])
+                    matches.append((start, end, index))
+
+        # 원문 위치로 (음수 시작은 앞 조각의 글자)
+        if positions is not None:
+            matches = [(self._position(start, tail, offset, positions), offset + positions[end], index)
+                       for start, end, index in matches]
+        elif tail:
+            matches = [(tail[start] if start < 0 else start + offset, end + offset, index)
+                       for start, end, index in matches]
+        elif offset:
+            matches = [(start + offset, end + offset, index) for start, end, index in matches]
+        return matches, (state, self._tail(text, tail, offset, positions))
+
+    @staticmethod
+    def _position(start, tail, offset, positions):
+        """scan() 안의 시작 위치 → 원문 위치 (음수는 앞 조각의 글자)"""
+        if start < 0:
+            return tail[start]
+        return offset + (start if positions is None else positions[start])
+
+    def _tail(self, text, tail, offset, positions):
+        """다음 조각에서 이어질 키워드의 시작을 찾을 수 있게 마지막 글자 위치들을 보관 (공백 제외)"""
+        keep = self._max_length - 1
+        recent = []
+        j = len(text) - 1
+        while j >= 0 and len(recent) < keep:
+            if text[j] not in IGNORABLE:
+                recent.append(self._position(j, tail, offset, positions))
+            j -= 1
+        recent.reverse()
+        if len(recent) < keep:
+            recent = list(tail[len(recent) - keep:]) + recent
+        return tuple(recent)
+
+    def find_all(self, text):
+        """키워드별 발견 위치 {keyword: [(start, end), ...]}"""
+        matches, _ = self.scan(text)
+        return self.collect(matches)
+
+    def collect(self, matches):
+        """scan() 결과를 키워드별 위치로 모으고 간격 키워드까지 계산"""
+        spans = {}
+        for start, end, index in matches:
+            spans.setdefault(index, []).append((start, end))
+        hits = {}
+        for index, found in spans.items():
+            for name in self.names[index]:
+                hits[name] = list(found)
+        for pattern in self.gap_patterns:
+            spans = pattern.match(hits)
+            if spans:
+                hits[pattern.keyword] = spans
+        return hits
+
+
+def _start_of(text, i, length):
+    """text[i]에서 끝나는 키워드(공백 제외 length 글자)의 시작 위치
+
+    앞 조각에서 시작한 키워드면 음수 -n (앞 조각의 공백 아닌 마지막 글자들 중 뒤에서 n번째)
+    """
+    remaining = length
+    j = i
+    while j >= 0:
+        if text[j] not in IGNORABLE:
+            remaining -= 1
+            if remaining == 0:
+                return j
+        j -= 1
+    return -remaining
@@ -0,0 +1,186 @@
+"""
+사진(JPG/PNG) 계약서 글자 인식
+Pillow로 전처리(축소, 흑백, 이진화, 기울기 보정)한 뒤 글줄 사이 빈 줄에서 잘라
+조각마다 Tesseract(한국어)로 동시에 인식한다
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from PIL import Image, ImageOps
+
+from upload_ingest import BufferReader
+
+try:
+    import pytesseract
+except ImportError:  # 설치되지 않은 환경에서는 OCR만 사용할 수 없음
+    pytesseract = None
+
+# Tesseract 언어 / 설정 (글 덩어리 하나로 인식)
+OCR_LANG = "kor"
+OCR_CONFIG = "--oem 1 --psm 6"
+
+# 긴 변이 이보다 크면 축소 (휴대폰 사진은 4000px 이상이라 인식 시간만 길어짐)
+MAX_SIDE = 2400
+
+# 조각 높이 (이 근처의 빈 줄에서 자름)
+TILE_HEIGHT = 900
+
+# 기울기 보정 범위 / 간격 (도)
+DESKEW_RANGE = 5.0
+DESKEW_STEP = 0.5
+
+# 인식 결과를 기다리는 동안 취소/시간 제한을 확인하는 간격 (초)
+POLL_SECONDS = 0.2
+
+# 조각 하나를 인식하는 Tesseract 프로세스의 제한 시간 (초, 넘으면 프로세스를 끝내고 빈 조각으로)
+TILE_TIMEOUT_SECONDS = 30
+
+# 조각을 동시에 인식하므로 Tesseract 자체의 멀티스레드는 끔
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+
+class OcrUnavailable(RuntimeError):
+    """pytesseract나 Tesseract 한국어 데이터가 없음"""
+
+
+def preprocess(image):
+    """인식용 흑백 이미지로 변환 (축소 → 흑백 → 기울기 보정 → 이진화)"""
+    image = ImageOps.exif_transpose(image)
+    gray = image.convert("L")
+    if max(gray.size) > MAX_SIDE:
+        gray.thumbnail((MAX_SIDE, MAX_SIDE), Image.LANCZOS)
+    gray = ImageOps.autocontrast(gray)
+    angle = estimate_skew(gray)
+    if angle:
+        gray = gray.rotate(angle, resample=Image.BICUBIC, expand=True, fillcolor=255)
+    threshold = _otsu_threshold(gray)
+    return gray.point(lambda value: 255 if value > threshold else 0, mode="1").convert("L")
+
+
+def _otsu_threshold(gray):
+    """흑백 이미지의 글자/배경 경계 밝기 (Otsu)"""
+    histogram = gray.histogram()
+    total = sum(histogram)
+    weighted_total = sum(i * count for i, count in enumerate(histogram))
+    background = weighted = 0
+    best, threshold = -1.0, 127
+    for i, count in enumerate(histogram):
+        background += count
+        if background == 0:
+            continue
+        foreground = total - background
+        if foreground == 0:
+            break
+        weighted += i * count
+        mean_back = weighted / background
+        mean_fore = (weighted_total - weighted) / foreground
+        between = background * foreground * (mean_back - mean_fore) ** 2
+        if between > best:
+            best, threshold = between, i
+    return threshold
+
+
+def estimate_skew(gray):
+    """글줄이 가장 또렷하게 나뉘는 회전 각도 (작은 사본으로 계산)"""
+    small = gray.copy()
+    small.thumbnail((600, 600))
+    small = ImageOps.invert(small)
+
+    def sharpness(angle):
+        # 가로줄별 잉크 양의 변화가 클수록 글줄이 수평
+        rotated = small.rotate(angle, resample=Image.BILINEAR)
+        rows = list(rotated.resize((1, rotated.height), Image.BOX).getdata())
+        return sum((a - b) ** 2 for a, b in zip(rows, rows[1:]))
+
+    steps = int(DESKEW_RANGE / DESKEW_STEP)
+    angles = [i * DESKEW_STEP for i in range(-steps, steps + 1)]
+    best = max(angles, key=sharpness)
+    return best if sharpness(best) > sharpness(0) else 0.0
+
+
+def split_tiles(image, tile_height=TILE_HEIGHT):
+    """가로로 긴 조각들로 나눔 (글줄이 잘리지 않도록 빈 줄에서 자름)"""
+    if image.height <= tile_height * 1.5:
+        return [image]
+
+    # 가로줄별 평균 밝기 (255면 글자가 없는 줄)
+    rows = list(image.resize((1, image.height), Image.BOX).getdata())
+    tiles = []
+    top = 0
+    while image.height - top > tile_height * 1.5:
+        target = top + tile_height
+        window = range(target - tile_height // 4, min(target + tile_height // 4, image.height))
+        cut = max(window, key=lambda y: (rows[y], -abs(y - target)))
+        tiles.append(image.crop((0, top, image.width, cut)))
+        top = cut
+    tiles.append(image.crop((0, top, image.width, image.height)))
+    return tiles
+
+
+def _recognize(tile):
+    try:
+        return pytesseract.image_to_string(tile, lang=OCR_LANG, config=OCR_CONFIG,
+                                           timeout=TILE_TIMEOUT_SECONDS).strip()
+    except pytesseract.TesseractError:
+        raise
+    except RuntimeError:
+        # 시간 초과 - pytesseract가 프로세스를 끝냄 (인식이 끝나지 않는 조각 하나가 작업 자리를 붙잡지 않게)
+        return ""
+
+
+def check_available():
+    """OCR을 쓸 수 있는지 확인 (없으면 OcrUnavailable)"""
+    if pytesseract is None:
+        raise OcrUnavailable("pytesseract가 설치되어 있지 않습니다")
+    try:
+        languages = pytesseract.get_languages(config="")
+    except pytesseract.TesseractNotFoundError:
+        raise OcrUnavailable("Tesseract OCR이 설치되어 있지 않습니다")
+    if OCR_LANG not in languages:
+        raise OcrUnavailable(f"Tesseract 한국어 데이터({OCR_LANG})가 설치되어 있지 않습니다")
+
+
+def ocr_images(images, workers=None, on_tile=None, should_stop=None):
+    """사진 여러 장(bytes / memoryview 또는 PIL 이미지) → 본문 텍스트
+
+    사진과 조각은 순서대로 이어 붙이고, 인식은 여러 스레드에서 동시에 한다
+    (Tesseract는 별도 프로세스로 돌기 때문에 스레드로도 여러 코어를 씀).
+    on_tile(조각 번호, 전체 조각 수, 이어 붙일 조각 텍스트): 조각이 순서대로 끝날 때마다 호출
+    should_stop: True를 돌려주면 남은 조각은 인식하지 않음 (취소/시간 제한용)
+    """
+    check_available()
+
+    tiles = []
+    for image in images:
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            with BufferReader(image) as stream:
+                tiles += split_tiles(preprocess(Image.open(stream)))
+        else:
+            tiles += split_tiles(preprocess(image))
+
+    parts = []
+    workers = workers or os.cpu_count() or 1
+    pool = ThreadPoolExecutor(max_workers=min(workers, len(tiles)))
+    futures = [pool.submit(_recognize, tile) for tile in tiles]
+    try:
+        for number, future in enumerate(futures, 1):
+            while True:
+                if should_stop is not None and should_stop():
+                    return "".join(parts)
+                try:
+                    text = future.result(timeout=POLL_SECONDS)
+                    break
+                except FutureTimeout:
+                    pass
+            piece = "\n" + text if parts else text
+            parts.append(piece)
+            if on_tile is not None:
+                on_tile(number, len(tiles), piece)
+    finally:
+        # 멈춘 경우 아직 시작하지 않은 조각은 버림
+        for future in futures:
+            future.cancel()
+        pool.shutdown(wait=False)
+    return "".join(parts)
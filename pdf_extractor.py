@@ -0,0 +1,254 @@
+"""
+PDF 텍스트 추출
+페이지를 여러 프로세스에 나눠 추출하고, 페이지별 텍스트와 시작 위치를 보관했다가
+본문은 마지막에 한 번만 합친다 (분석 결과에 쪽 번호를 붙이는 데 사용)
+PDF 내용은 bytes나 memoryview로 받고, 워커들은 공유 메모리 한 벌을 함께 읽는다.
+취소/시간 제한이 있으면 쪽수 세기부터 별도 프로세스에서 하고, 멈출 때 그 프로세스들을 끝낸다
+"""
+
+import multiprocessing
+import os
+import time
+from bisect import bisect_right
+from collections import deque
+from multiprocessing import shared_memory
+
+import PyPDF2
+
+from upload_ingest import BufferReader
+
+# 페이지 사이에 넣는 구분자 (다음 쪽 첫 줄의 조 머리글이 앞 줄에 붙지 않도록)
+PAGE_SEPARATOR = "\n"
+
+# 이 쪽수 이하는 프로세스를 띄우지 않고 바로 추출 (프로세스 시작 비용이 더 큼)
+INLINE_PAGE_LIMIT = 8
+
+# 워커에 한 번에 맡기는 쪽수
+PAGES_PER_TASK = 4
+
+# 워커 결과를 기다리는 동안 취소/시간 제한을 확인하는 간격 (초)
+POLL_SECONDS = 0.2
+
+# 워커 프로세스의 PDF (워커당 한 번만 읽음)
+_worker_memory = None
+_worker_reader = None
+
+
+def _init_worker(memory_name, size):
+    global _worker_memory, _worker_reader
+    _worker_memory = shared_memory.SharedMemory(name=memory_name)
+    _worker_reader = PyPDF2.PdfReader(BufferReader(_worker_memory.buf[:size]))
+
+
+def _extract_range(start, stop):
+    return [_extract_page(_worker_reader.pages[i]) for i in range(start, stop)]
+
+
+def _count_worker_pages():
+    return len(_worker_reader.pages)
+
+
+def count_pages(data):
+    with BufferReader(data) as stream:
+        return len(PyPDF2.PdfReader(stream).pages)
+
+
+def _extract_page(page):
+    try:
+        return page.extract_text() or ""
+    except Exception:
+        # 글꼴이 깨진 쪽 하나 때문에 전체를 버리지 않음
+        return ""
+
+
+class PdfText:
+    """쪽별 텍스트와 각 쪽의 본문 내 시작 위치
+
+    append()로 한 쪽씩 추가하고, 본문 전체(text)는 처음 필요할 때 한 번만 합친다.
+    keep_text=False면 쪽 구간만 계산하고 텍스트는 보관하지 않는다 (조각을 바로 스트리밍 분석에 넘길 때).
+    """
+
+    def __init__(self, total_pages=0, keep_text=True):
+        self.total_pages = total_pages
+        self.pages = [] if keep_text else None
+        self.offsets = []
+        self.ends = []
+        self.length = 0
+        self.truncated = False      # 쪽수/시간 제한으로 뒤쪽을 읽지 못했는지
+        self._text = None
+
+    @property
+    def page_count(self):
+        return len(self.offsets)
+
+    def append(self, page_text):
+        """한 쪽을 추가하고, 앞 본문에 이어 붙일 조각(구분자 포함)을 반환"""
+        piece = PAGE_SEPARATOR + page_text if self.offsets else page_text
+        self.offsets.append(self.length + len(piece) - len(page_text))
+        self.length += len(piece)
+        self.ends.append(self.length)
+        if self.pages is not None:
+            self.pages.append(page_text)
+        self._text = None
+        return piece
+
+    @property
+    def text(self):
+        if self.pages is None:
+            raise ValueError("쪽 텍스트를 보관하지 않은 문서입니다 (keep_text=False)")
+        if self._text is None:
+            self._text = PAGE_SEPARATOR.join(self.pages)
+        return self._text
+
+    def page_at(self, offset):
+        """본문 위치가 속한 쪽 번호 (1부터)"""
+        return max(bisect_right(self.offsets, offset), 1)
+
+    def page_ranges(self):
+        """분석 결과에 붙일 쪽 구간 [(쪽 번호, start, end), ...]"""
+        return [
+            (number, start, end)
+            for number, (start, end) in enumerate(zip(self.offsets, self.ends), 1)
+        ]
+
+
+class PageExtractor:
+    """쪽 추출 프로세스들 (공유 메모리에 올린 PDF 한 벌을 함께 읽음)
+
+    결과를 기다리는 동안 취소/시간 제한을 확인하고, 도중에 멈추면 돌고 있는 프로세스를 기다리지 않고 끝낸다
+    (깨진 PDF 하나가 프로세스와 분석 작업 자리를 계속 붙잡고 있지 않게).
+    """
+
+    def __init__(self, data, workers):
+        with memoryview(data) as view, view.cast("B") as flat:
+            size = len(flat)
+            self._memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+            self._memory.buf[:size] = flat
+        try:
+            self._pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=(self._memory.name, size))
+        except BaseException:
+            self._release_memory()
+            raise
+
+    def submit(self, func, *args):
+        return self._pool.apply_async(func, args)
+
+    def wait(self, task, expired):
+        """작업 결과 (기다리는 도중 expired()가 True가 되면 None)"""
+        while True:
+            try:
+                return task.get(timeout=POLL_SECONDS)
+            except multiprocessing.TimeoutError:
+                if expired():
+                    return None
+
+    def close(self, finished=True):
+        """프로세스 정리 (finished=False면 남은 작업을 기다리지 않고 프로세스를 끝냄)"""
+        if finished:
+            self._pool.close()
+        else:
+            self._pool.terminate()
+        self._pool.join()
+        self._release_memory()
+
+    def _release_memory(self):
+        self._memory.close()
+        self._memory.unlink()
+
+
+def iter_pages(data, workers=None, max_pages=None, time_limit=None, total=None, should_stop=None,
+               on_total=None):
+    """PDF 내용(bytes / memoryview)에서 (쪽 번호, 텍스트)를 쪽 순서대로 하나씩 반환
+
+    workers: 프로세스 수 (기본: CPU 수, 1이면서 멈출 조건이 없으면 현재 프로세스에서 추출)
+    max_pages: 앞에서부터 이 쪽수까지만 추출
+    time_limit: 추출 시작 후 이 시간(초)이 지나면 남은 쪽은 건너뜀
+    total: 이미 센 전체 쪽수 (없으면 직접 셈)
+    should_stop: True를 돌려주면 남은 쪽을 건너뜀 (취소용, 수시로 호출됨)
+    on_total(전체 쪽수): 쪽수를 센 뒤 첫 쪽보다 먼저 호출 (세는 도중 멈추면 호출되지 않음)
+
+    time_limit이나 should_stop이 있으면 쪽수 세기와 추출을 모두 별도 프로세스에서 하고,
+    멈추면 그 프로세스들을 바로 끝낸다 (한 쪽에서 멈춰 버린 PyPDF2를 현재 스레드가 기다리지 않음).
+    """
+    deadline = time.monotonic() + time_limit if time_limit else None
+    workers = workers or os.cpu_count() or 1
+    stoppable = deadline is not None or should_stop is not None
+
+    def expired():
+        if should_stop is not None and should_stop():
+            return True
+        return deadline is not None and time.monotonic() > deadline
+
+    if not stoppable:
+        if total is None:
+            total = count_pages(data)
+        count = min(total, max_pages) if max_pages else total
+        if workers == 1 or count <= INLINE_PAGE_LIMIT:
+            if on_total is not None:
+                on_total(total)
+            with BufferReader(data) as stream:
+                reader = PyPDF2.PdfReader(stream)
+                for i in range(count):
+                    yield i + 1, _extract_page(reader.pages[i])
+            return
+
+    if expired():
+        return
+    # 워커마다 PDF를 복사해 보내지 않도록 공유 메모리에 한 번만 올림
+    extractor = PageExtractor(data, workers)
+    finished = False
+    try:
+        if total is None:
+            total = extractor.wait(extractor.submit(_count_worker_pages), expired)
+            if total is None:
+                return
+        if on_total is not None:
+            on_total(total)
+        count = min(total, max_pages) if max_pages else total
+
+        ranges = deque((start, min(start + PAGES_PER_TASK, count)) for start in range(0, count, PAGES_PER_TASK))
+        pending = deque()
+        # 앞쪽부터 순서대로 받아야 하므로 진행 중인 작업 수를 제한
+        while ranges and len(pending) < workers * 2:
+            start, stop = ranges.popleft()
+            pending.append((start, extractor.submit(_extract_range, start, stop)))
+
+        while pending:
+            start, task = pending.popleft()
+            # 취소/시간 제한을 확인하며 기다림
+            texts = extractor.wait(task, expired)
+            if texts is None:
+                return
+            if ranges:
+                next_start, next_stop = ranges.popleft()
+                pending.append((next_start, extractor.submit(_extract_range, next_start, next_stop)))
+            for offset, text in enumerate(texts):
+                yield start + offset + 1, text
+            if expired():
+                return
+        finished = True
+    finally:
+        # 제한에 걸려 멈춘 경우 돌고 있는 쪽까지 프로세스째 끝냄
+        extractor.close(finished)
+
+
+def extract_pdf(data, workers=None, max_pages=None, time_limit=None, on_page=None, should_stop=None,
+                keep_text=True):
+    """PDF 내용(bytes / memoryview) → PdfText
+
+    on_page(쪽 번호, 전체 쪽수, 이어 붙일 조각): 쪽을 받을 때마다 호출 (스트리밍 분석/진행률 표시용)
+    keep_text: False면 쪽 텍스트는 on_page로만 넘기고 보관하지 않음 (쪽 구간만 계산)
+    쪽수를 세는 도중 멈추면 total_pages는 0, truncated는 True
+    """
+    document = PdfText(None, keep_text)
+
+    def counted(total):
+        document.total_pages = total
+
+    for number, page_text in iter_pages(data, workers, max_pages, time_limit, None, should_stop, counted):
+        piece = document.append(page_text)
+        if on_page is not None:
+            on_page(number, document.total_pages, piece)
+    document.truncated = document.total_pages is None or document.page_count < document.total_pages
+    document.total_pages = document.total_pages or 0
+    return document
@@ -0,0 +1,357 @@
+"""
+리포트 생성
+분석 결과를 한 번만 훑어 보기 모델로 정리하고, 미리 만들어 둔 템플릿으로
+상세 리포트 / 변호사 개선 요청서를 TXT · Markdown · JSON · HTML로 만든다.
+만든 리포트는 분석 결과 해시별로 보관해 두고, 처음 요청할 때만 만든다
+"""
+
+import html
+import json
+import re
+from string import Template
+
+from contract_analyzer import describe_spans, span_positions, specificity_text
+from result_cache import ResultCache
+
+# 형식 → (MIME 타입, 확장자)
+FORMATS = {
+    "txt": ("text/plain", "txt"),
+    "md": ("text/markdown", "md"),
+    "json": ("application/json", "json"),
+    "html": ("text/html", "html"),
+}
+
+# 문서 → (이름, 파일 이름)
+DOCUMENTS = {
+    "report": ("상세 리포트", "contract_analysis_report"),
+    "request": ("변호사 개선 요청서", "improvement_request"),
+}
+
+LEVEL_EMOJI = {"매우높음": "🔴🔴", "높음": "🔴", "중간": "🟡", "낮음": "🟢"}
+
+DOUBLE_CHECK_QUESTIONS = [
+    "가압류/가처분도 위임 범위에 포함되나요?",
+    "시간당 차지 금액이 얼마인가요?",
+    "화해로 끝나도 성과보수를 내야 하나요?",
+    "일부 승소 시 비율 계산은 어떻게 하나요?",
+    "계약 해지 시 환불 금액은 어떻게 계산하나요?",
+]
+
+REPORT_RULE = "=" * 50
+REQUEST_RULE = "=" * 60
+
+_HTML_STYLE = (
+    "body{font-family:sans-serif;max-width:48rem;margin:2rem auto;padding:0 1rem;line-height:1.6}"
+    "h2{border-bottom:1px solid #ddd;padding-bottom:.3rem}"
+    ".item{margin:0 0 1rem}.item p{margin:.2rem 0 .2rem 1rem}"
+)
+
+# 형식별 템플릿 (모듈을 읽을 때 한 번만 만듦)
+# $items 자리에는 항목 템플릿으로 만든 줄들이, 그 밖의 자리에는 (HTML이면 이스케이프된) 값이 들어간다
+_TEMPLATES = {
+    "txt": {
+        "document": "$body",
+        "report_header": "$rule\n📊 계약서 품질 분석 결과\n$rule\n\n$emoji 종합 점수: $score/100 ($grade)\n\n",
+        "request_header": "$rule\n계약서 개선 요청서\n$rule\n\n",
+        "section": "$rule\n$title\n$rule\n\n",
+        "note": "$text\n\n",
+        "evidence": "    근거: $evidence\n",
+        "risk": "[$number] $emoji $description\n    위험도: $level\n${evidence}    이유: $why\n"
+                "    💡 제안: $suggestion\n\n",
+        "issue": "[$number] ⚠️ $clause\n    문제: $problem\n${evidence}    💡 제안: $suggestion\n\n",
+        "missing_note": "    $label: $risk\n",
+        "clause": "$check $name: $description\n${missing}\n",
+        "clauses": "$items",
+        "request_risk": "[$number] $description\n    → 개선 요청: $suggestion\n\n",
+        "request_issue": "[$number] $clause\n    → $suggestion\n\n",
+        "missing": "- $name: $description\n",
+        "missing_list": "$items\n",
+        "question": "□ $question\n",
+        "questions": "$items\n",
+        "closing": "$rule\n\n위 사항들에 대해 명확한 답변 부탁드립니다.\n감사합니다.\n\n의뢰인 올림\n",
+    },
+    "md": {
+        "document": "$body",
+        "report_header": "# 📊 계약서 품질 분석 결과\n\n**$emoji 종합 점수: $score/100 ($grade)**\n\n",
+        "request_header": "# 계약서 개선 요청서\n\n",
+        "section": "## $title\n\n",
+        "note": "$text\n\n",
+        "evidence": "- 근거: $evidence\n",
+        "risk": "### $number. $emoji $description\n\n- 위험도: $level\n${evidence}- 이유: $why\n"
+                "- 💡 제안: $suggestion\n\n",
+        "issue": "### $number. ⚠️ $clause\n\n- 문제: $problem\n${evidence}- 💡 제안: $suggestion\n\n",
+        "missing_note": "  - $label: $risk\n",
+        "clause": "- $check **$name**: $description\n${missing}",
+        "clauses": "$items\n",
+        "request_risk": "**[$number] $description**  \n→ 개선 요청: $suggestion\n\n",
+        "request_issue": "**[$number] $clause**  \n→ $suggestion\n\n",
+        "missing": "- **$name**: $description\n",
+        "missing_list": "$items\n",
+        "question": "- [ ] $question\n",
+        "questions": "$items\n",
+        "closing": "---\n\n위 사항들에 대해 명확한 답변 부탁드립니다.  \n감사합니다.\n\n의뢰인 올림\n",
+    },
+    "html": {
+        "document": "<!DOCTYPE html>\n<html lang=\"ko\">\n<head>\n<meta charset=\"utf-8\">\n"
+                    "<title>$title</title>\n<style>" + _HTML_STYLE + "</style>\n</head>\n<body>\n$body</body>\n</html>\n",
+        "report_header": "<h1>📊 계약서 품질 분석 결과</h1>\n<p><strong>$emoji 종합 점수: $score/100 ($grade)</strong></p>\n",
+        "request_header": "<h1>계약서 개선 요청서</h1>\n",
+        "section": "<h2>$title</h2>\n",
+        "note": "<p>$text</p>\n",
+        "evidence": "<p>근거: $evidence</p>\n",
+        "risk": "<div class=\"item\"><h3>$number. $emoji $description</h3>\n<p>위험도: $level</p>\n${evidence}"
+                "<p>이유: $why</p>\n<p>💡 제안: $suggestion</p></div>\n",
+        "issue": "<div class=\"item\"><h3>$number. ⚠️ $clause</h3>\n<p>문제: $problem</p>\n${evidence}"
+                 "<p>💡 제안: $suggestion</p></div>\n",
+        "missing_note": "<br>$label: $risk",
+        "clause": "<li>$check <strong>$name</strong>: $description${missing}</li>\n",
+        "clauses": "<ul>\n$items</ul>\n",
+        "request_risk": "<div class=\"item\"><strong>[$number] $description</strong><p>→ 개선 요청: $suggestion</p></div>\n",
+        "request_issue": "<div class=\"item\"><strong>[$number] $clause</strong><p>→ $suggestion</p></div>\n",
+        "missing": "<li><strong>$name</strong>: $description</li>\n",
+        "missing_list": "<ul>\n$items</ul>\n",
+        "question": "<li>☐ $question</li>\n",
+        "questions": "<ul>\n$items</ul>\n",
+        "closing": "<hr>\n<p>위 사항들에 대해 명확한 답변 부탁드립니다.<br>감사합니다.</p>\n<p>의뢰인 올림</p>\n",
+    },
+}
+_TEMPLATES = {fmt: {name: Template(text) for name, text in templates.items()}
+              for fmt, templates in _TEMPLATES.items()}
+
+# 근거 키워드에 정규식 조각('중요한.*통지')이 들어갈 수 있으므로 Markdown 기호는 이스케이프
+_MARKDOWN_SPECIAL = re.compile(r"([\\`*_\[\]<>|])")
+
+_ESCAPE = {
+    "txt": str,
+    "md": lambda value: _MARKDOWN_SPECIAL.sub(r"\\\1", str(value)),
+    "html": lambda value: html.escape(str(value)),
+}
+
+
+def grade_of(score):
+    """점수 → (등급, 이모지)"""
+    if score >= 80:
+        return "우수", "✅"
+    if score >= 60:
+        return "보통", "⚠️"
+    return "주의", "🚨"
+
+
+def build_view(results, evidence=True):
+    """분석 결과를 한 번 훑어 모든 형식이 함께 쓰는 보기 모델로 정리 (값은 문자열/숫자만)
+
+    evidence=False면 근거 위치 설명을 만들지 않는다 (개선 요청서는 쓰지 않고, 긴 문서에서는 비쌈).
+    """
+    grade, emoji = grade_of(results.score)
+    positions = span_positions(results) if evidence else None
+
+    def describe(spans):
+        if evidence and spans:
+            return describe_spans(results, spans, positions=positions)
+        return ""
+
+    risks = []
+    for i, risk in enumerate(results.risks, 1):
+        rule = results.risk_rule(risk.name)
+        risks.append({
+            "number": i,
+            "name": risk.name,
+            "emoji": LEVEL_EMOJI.get(rule["risk_level"], "⚠️"),
+            "description": rule["description"],
+            "level": rule["risk_level"],
+            "evidence": describe(risk.spans),
+            "why": rule["why_risky"],
+            "suggestion": rule["suggestion"],
+        })
+
+    issues = []
+    for i, clause in enumerate(results.specificity_issues, 1):
+        problem, suggestion = specificity_text(clause)
+        issues.append({
+            "number": i,
+            "clause": clause.name,
+            "problem": problem,
+            "evidence": describe(clause.specificity_spans),
+            "suggestion": suggestion,
+        })
+
+    clauses = {}
+    for importance in ("필수", "권장"):
+        clauses[importance] = [
+            {
+                "name": clause.name,
+                "found": clause.found,
+                "description": rule["description"],
+                "risk_if_missing": rule["risk_if_missing"],
+            }
+            for clause, rule in results.clauses_of(importance)
+        ]
+
+    return {
+        "score": results.score,
+        "grade": grade,
+        "emoji": emoji,
+        "risks": risks,
+        "issues": issues,
+        "required": clauses["필수"],
+        "recommended": clauses["권장"],
+        "partial": results.partial,
+        "evidence": evidence,
+    }
+
+
+def _needs_evidence(document, fmt):
+    return document == "report"
+
+
+def _fill(templates, escape, name, values=(), **parts):
+    """템플릿 하나 채우기 (values는 이스케이프, parts는 이미 만든 조각이라 그대로)"""
+    mapping = {key: escape(value) for key, value in dict(values).items()}
+    mapping.update(parts)
+    return templates[name].substitute(mapping)
+
+
+def _report_parts(view, templates, escape):
+    fill = lambda name, values=(), **parts: _fill(templates, escape, name, values, **parts)
+
+    def evidence(item):
+        return fill("evidence", {"evidence": item["evidence"]}) if item["evidence"] else ""
+
+    yield fill("report_header", {"rule": REPORT_RULE, "emoji": view["emoji"],
+                                 "score": view["score"], "grade": view["grade"]})
+
+    if view["risks"]:
+        yield fill("section", {"rule": REPORT_RULE, "title": f"⚠️ 위험 조항 발견 ({len(view['risks'])}개)"})
+        for risk in view["risks"]:
+            yield fill("risk", risk, evidence=evidence(risk))
+    else:
+        yield fill("note", {"text": "✅ 위험 조항이 발견되지 않았습니다."})
+
+    if view["issues"]:
+        yield fill("section", {"rule": REPORT_RULE, "title": f"📝 구체성 문제 ({len(view['issues'])}개)"})
+        yield fill("note", {"text": "다음 조항들이 있지만 충분히 구체적이지 않습니다:"})
+        for issue in view["issues"]:
+            yield fill("issue", issue, evidence=evidence(issue))
+        yield fill("note", {"text": "⚠️ 모호한 표현 대신 구체적인 금액/방법을 요청하세요!"})
+
+    for key, title, missing_check, missing_label in (
+        ("required", "📋 필수 조항 체크", "❌", "⚠️ 위험"),
+        ("recommended", "📌 권장 조항", "⭕", "💡 있으면 더 좋아요"),
+    ):
+        yield fill("section", {"rule": REPORT_RULE, "title": title})
+        items = "".join(
+            fill("clause", {"check": "✅" if clause["found"] else missing_check,
+                            "name": clause["name"], "description": clause["description"]},
+                 missing="" if clause["found"] else fill(
+                     "missing_note", {"label": missing_label, "risk": clause["risk_if_missing"]}))
+            for clause in view[key]
+        )
+        yield fill("clauses", items=items)
+
+
+def _request_parts(view, templates, escape):
+    fill = lambda name, values=(), **parts: _fill(templates, escape, name, values, **parts)
+
+    yield fill("request_header", {"rule": REQUEST_RULE})
+    yield fill("note", {"text": "변호사님께,"})
+    yield fill("note", {"text": "계약서를 검토한 결과 다음 사항에 대해 명확히 해주시면 감사하겠습니다:"})
+
+    if view["risks"]:
+        yield fill("section", {"rule": REQUEST_RULE, "title": "1. 위험 조항 개선 요청"})
+        for risk in view["risks"]:
+            yield fill("request_risk", risk)
+
+    if view["issues"]:
+        yield fill("section", {"rule": REQUEST_RULE, "title": "2. 구체성 개선 요청"})
+        for issue in view["issues"]:
+            yield fill("request_issue", issue)
+
+    missing = [clause for clause in view["required"] if not clause["found"]]
+    if missing:
+        yield fill("section", {"rule": REQUEST_RULE, "title": "3. 누락된 필수 조항"})
+        yield fill("missing_list", items="".join(fill("missing", clause) for clause in missing))
+
+    yield fill("section", {"rule": REQUEST_RULE, "title": "4. 추가 확인 질문"})
+    yield fill("questions", items="".join(fill("question", {"question": question})
+                                          for question in DOUBLE_CHECK_QUESTIONS))
+    yield fill("closing", {"rule": REQUEST_RULE})
+
+
+def render_view(view, document="report", fmt="txt"):
+    """보기 모델 → 문서 문자열"""
+    if fmt == "json":
+        if document == "request":
+            view = {
+                "risks": [{"number": r["number"], "description": r["description"], "suggestion": r["suggestion"]}
+                          for r in view["risks"]],
+                "issues": [{"number": i["number"], "clause": i["clause"], "suggestion": i["suggestion"]}
+                           for i in view["issues"]],
+                "missing_required": [c for c in view["required"] if not c["found"]],
+                "questions": DOUBLE_CHECK_QUESTIONS,
+            }
+        else:
+            view = {key: value for key, value in view.items() if key != "evidence"}
+        return json.dumps({"document": document, **view}, ensure_ascii=False, indent=2)
+
+    templates = _TEMPLATES[fmt]
+    escape = _ESCAPE[fmt]
+    parts = _report_parts if document == "report" else _request_parts
+    body = "".join(parts(view, templates, escape))
+    if fmt == "txt":
+        # 줄마다 붙인 줄바꿈 중 마지막 하나는 뺌 (예전 리포트와 같은 모양)
+        return body[:-1]
+    return _fill(templates, escape, "document", {"title": DOCUMENTS[document][0]}, body=body)
+
+
+def render(results, document="report", fmt="txt"):
+    """분석 결과 → 문서 문자열 (보관하지 않음)"""
+    if document not in DOCUMENTS or fmt not in FORMATS:
+        raise ValueError(f"지원하지 않는 문서/형식입니다: {document}/{fmt}")
+    return render_view(build_view(results, _needs_evidence(document, fmt)), document, fmt)
+
+
+def results_hash(results):
+    """분석 결과 내용의 해시 (결과 캐시 키가 없을 때 리포트 보관 키로 사용)"""
+    return results.fingerprint()
+
+
+class ReportCache:
+    """분석 결과 해시별 리포트 보관 (처음 요청한 문서/형식만 만들고, 이후에는 그대로 돌려줌)
+
+    보기 모델도 결과마다 한 번만 만든다 (개선 요청서만 받았다면 상세 리포트를 요청할 때 근거 위치를 채워 다시 만듦).
+    결과와 같은 시간 동안만 보관한다.
+    """
+
+    def __init__(self, maxsize=64, ttl_seconds=300):
+        self._entries = ResultCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
+
+    def get(self, results, document="report", fmt="txt", key=None):
+        """문서 문자열 (key: 결과 캐시 키 - 없으면 결과 내용으로 해시)"""
+        if document not in DOCUMENTS or fmt not in FORMATS:
+            raise ValueError(f"지원하지 않는 문서/형식입니다: {document}/{fmt}")
+        key = key or results_hash(results)
+        evidence = _needs_evidence(document, fmt)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = {"view": build_view(results, evidence)}
+            self._entries.put(key, entry)
+        elif evidence and not entry["view"]["evidence"]:
+            entry["view"] = build_view(results, evidence)
+        rendered = entry.get((document, fmt))
+        if rendered is None:
+            rendered = entry[(document, fmt)] = render_view(entry["view"], document, fmt)
+        return rendered
+
+    def discard(self, key):
+        self._entries.discard(key)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def file_name(document, fmt):
+    return f"{DOCUMENTS[document][1]}.{FORMATS[fmt][1]}"
+
+
+def content_type(fmt):
+    return f"{FORMATS[fmt][0]}; charset=utf-8"
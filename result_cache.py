@@ -0,0 +1,84 @@
+"""
+분석 결과 캐시
+같은 파일을 다시 올리면 추출/분석 없이 바로 결과를 돌려준다.
+본문은 보관하지 않고, 업로드 내용의 해시와 분석 결과만 정해진 시간 동안 메모리에 둔다
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# 프로세스마다 새로 만드는 해시 키 (캐시 키로 원본을 역추적하거나 다른 곳의 해시와 대조할 수 없게)
+_HASH_KEY = os.urandom(32)
+
+
+def result_key(data, ruleset):
+    """업로드 내용(bytes / memoryview 또는 str) + 규칙 팩 버전으로 캐시 키 생성"""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    digest = hashlib.blake2b(data, key=_HASH_KEY, digest_size=32)
+    digest.update(ruleset.content_hash.encode("ascii") if ruleset.content_hash else ruleset.label.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """LRU + 만료 시간 결과 캐시 (여러 세션/스레드에서 공유)
+
+    결과는 저장한 시점부터 ttl_seconds 동안만 유효하고, 다시 조회해도 연장되지 않는다.
+    돌려주는 결과는 저장된 객체 그대로이므로 호출하는 쪽에서 수정하면 안 된다.
+    """
+
+    def __init__(self, maxsize=128, ttl_seconds=300):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()       # 키 → (만료 시각, 결과)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """저장된 결과 (없거나 만료되면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, results = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return results
+
+    def put(self, key, results):
+        with self._lock:
+            self._purge_expired()
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def remaining(self, key):
+        """남은 유효 시간 (초, 없으면 0)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return max(0.0, entry[0] - time.monotonic()) if entry else 0.0
+
+    def discard(self, key):
+        """결과 즉시 삭제 (사용자가 '지금 삭제'를 누른 경우)"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            self._purge_expired()
+            return len(self._entries)
+
+    def _purge_expired(self):
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._entries.items() if now >= expires_at]
+        for key in expired:
+            del self._entries[key]
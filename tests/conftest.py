@@ -0,0 +1,6 @@
+"""테스트 공통 설정: 저장소 루트의 모듈을 바로 import"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
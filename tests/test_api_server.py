@@ -0,0 +1,48 @@
+"""API 워커: 요청마다 캐시 키를 만든 규칙 세트로 분석"""
+
+import json
+import shutil
+
+import pytest
+
+import api_server
+from contract_result import UnknownRuleset
+from contract_ruleset import DEFAULT_RULE_PACK, RulesetRegistry, load_rule_pack
+
+TEXT = "제1조(목적) 위임인은 수임인에게 사건을 위임한다."
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    """워커가 쓰는 기본 규칙 팩을 임시 복사본으로 (팩 변경 확인은 강제로 다시 읽을 때만)"""
+    path = tmp_path / "pack.json"
+    shutil.copy(DEFAULT_RULE_PACK, path)
+    registry = RulesetRegistry(str(path), cache_dir=None, check_seconds=3600)
+    monkeypatch.setattr(api_server, "get_ruleset", lambda path=None: registry.current())
+    monkeypatch.setattr(api_server, "reload_ruleset", lambda: registry.reload(force=True))
+    return registry
+
+
+def test_worker_follows_edited_pack(registry):
+    before = registry.current()
+    pack, _ = load_rule_pack(registry.path)
+    pack["name"] = pack.get("name", "") + " (수정)"
+    with open(registry.path, "w", encoding="utf-8") as f:
+        json.dump(pack, f, ensure_ascii=False)
+    _, content_hash = load_rule_pack(registry.path)
+
+    # 워커는 아직 예전 팩을 들고 있지만 요청한 쪽의 규칙 세트로 분석해야 함
+    assert registry.current() is before
+    results = api_server._analyze_request("text", TEXT, content_hash)
+    assert results.ruleset.content_hash == content_hash
+    assert results.ruleset is not before
+
+
+def test_worker_rejects_unknown_ruleset(registry):
+    with pytest.raises(UnknownRuleset):
+        api_server._analyze_request("text", TEXT, "0" * 64)
+
+
+def test_worker_uses_requested_ruleset(registry):
+    ruleset = registry.current()
+    assert api_server._analyze_request("text", TEXT, ruleset.content_hash).ruleset is ruleset
@@ -0,0 +1,34 @@
+"""규칙 평가: 금액 확인 / 보수 조건"""
+
+from contract_analyzer import analyze_contract
+from contract_ruleset import get_ruleset
+
+HOURLY_AND_RETAINER = "제3조【보수】 시간당 300,000원, 착수금 5,000,000원을 지급한다."
+
+
+def _risk(results, name):
+    return next((risk for risk in results.risks if risk.name == name), None)
+
+
+def test_check_amount_uses_amount_after_keyword():
+    results = analyze_contract(get_ruleset(), HOURLY_AND_RETAINER)
+    assert _risk(results, "시간차지과다") is None
+
+
+def test_check_amount_flags_excessive_hourly_rate():
+    text = "제3조【보수】 시간당 3,000,000원, 착수금 500,000원을 지급한다."
+    risk = _risk(analyze_contract(get_ruleset(), text), "시간차지과다")
+    assert risk is not None
+    assert "3,000,000원" in [text[start:end] for start, end, _ in risk.spans]
+    assert "500,000원" not in [text[start:end] for start, end, _ in risk.spans]
+
+
+def test_check_amount_flags_missing_amount():
+    results = analyze_contract(get_ruleset(), "제3조【보수】 보수는 시간당 별도로 정한다.")
+    assert _risk(results, "시간차지과다") is not None
+
+
+def test_fee_terms_read_nearest_amount():
+    results = analyze_contract(get_ruleset(), HOURLY_AND_RETAINER)
+    assert results.fees["hourly_rate"] == 300000
+    assert results.fees["retainer"] == 5000000
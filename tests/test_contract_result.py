@@ -0,0 +1,27 @@
+"""분석 결과 변환: 결과를 만든 규칙 세트와 함께만 복원"""
+
+import pickle
+
+import pytest
+
+from contract_analyzer import analyze_contract
+from contract_result import ContractResult, UnknownRuleset
+from contract_ruleset import get_ruleset
+
+TEXT = "제1조(목적) 위임인은 수임인에게 사건을 위임한다.\n제2조(보수) 착수금은 5,000,000원으로 한다."
+
+
+def test_round_trip_keeps_ruleset():
+    results = analyze_contract(get_ruleset(), TEXT)
+    restored = pickle.loads(pickle.dumps(results))
+    assert restored.ruleset is results.ruleset
+    assert restored.fingerprint() == results.fingerprint()
+    assert ContractResult.from_dict(results.to_dict()).fingerprint() == results.fingerprint()
+
+
+def test_unknown_ruleset_is_not_replaced():
+    data = analyze_contract(get_ruleset(), TEXT).to_dict()
+    data["ruleset_hash"] = "0" * 64
+    with pytest.raises(UnknownRuleset):
+        ContractResult.from_dict(data)
+    assert ContractResult.from_dict(data, get_ruleset()).ruleset is get_ruleset()
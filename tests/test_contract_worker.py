@@ -0,0 +1,82 @@
+"""백그라운드 분석 작업: 제한 시간에 추출 프로세스를 끝내고 부분 결과를 돌려주는지"""
+
+import os
+import sys
+import time
+
+import pytest
+
+import pdf_extractor
+from contract_analyzer import analyze_contract
+from contract_ruleset import get_ruleset
+from contract_worker import AnalysisJob
+from pdf_extractor import extract_pdf
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from corpus import generate_contract, make_pdf, split_pages  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def pdf():
+    return make_pdf(split_pages(generate_contract(20 * 1024, seed=3)))
+
+
+def _hang(start, stop):
+    # 추출이 끝나지 않는 쪽 (fork한 워커에서 실행됨 - 끝났는지 확인할 수 있게 프로세스 번호를 남김)
+    with open(os.path.join(os.environ["CONGA_TEST_PIDS"], str(os.getpid())), "w"):
+        pass
+    time.sleep(3600)
+
+
+@pytest.fixture
+def stuck_pages(tmp_path, monkeypatch):
+    """쪽 추출이 끝나지 않게 만들고, 멈춘 워커 프로세스 번호 목록을 돌려주는 함수를 줌"""
+    monkeypatch.setattr(pdf_extractor, "_extract_range", _hang)
+    monkeypatch.setenv("CONGA_TEST_PIDS", str(tmp_path))
+    return lambda: [int(name) for name in os.listdir(tmp_path)]
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def test_streamed_pdf_matches_one_shot(pdf):
+    job = AnalysisJob("pdf", pdf)
+    results = job.result()
+    document = extract_pdf(pdf, workers=1)
+    expected = analyze_contract(get_ruleset(), document.text)
+    expected.pages = document.page_ranges()
+    assert results.partial is None
+    assert results.fingerprint() == expected.fingerprint()
+
+
+def test_page_limit(pdf):
+    results = AnalysisJob("pdf", pdf, max_pages=2).result()
+    assert results.partial["reason"] == "page_limit"
+    assert results.partial["done"] == 2
+
+
+def test_deadline_terminates_stuck_extraction(pdf, stuck_pages):
+    job = AnalysisJob("pdf", pdf, deadline_seconds=1)
+    started = time.monotonic()
+    results = job.result()
+    assert time.monotonic() - started < 5
+    assert results.partial["reason"] == "deadline"
+    assert results.partial["done"] == 0
+    # 멈춘 추출 프로세스가 남아 있지 않음
+    assert stuck_pages()
+    assert not any(_alive(pid) for pid in stuck_pages())
+
+
+def test_cancel_terminates_stuck_extraction(pdf, stuck_pages):
+    job = AnalysisJob("pdf", pdf)
+    while not stuck_pages():
+        time.sleep(0.05)
+    job.cancel()
+    results = job.result()
+    assert results.partial["reason"] == "cancelled"
+    assert not any(_alive(pid) for pid in stuck_pages())
@@ -0,0 +1,29 @@
+"""매칭 엔진: 키워드가 나온 횟수만큼만 위치를 알려 주는지"""
+
+from contract_ruleset import get_ruleset
+from keyword_matcher import KeywordMatcher
+
+
+def test_overlapping_keywords_reported_once():
+    matcher = KeywordMatcher(["abcdefghijklmnop", "p"])
+    hits = matcher.find_all("xxabcdefghijklmnopxx")
+    assert hits == {"abcdefghijklmnop": [(2, 18)], "p": [(17, 18)]}
+
+
+def test_fullwidth_overlapping_keywords_reported_once():
+    matcher = KeywordMatcher(["abcdefghij", "j", "hij"])
+    hits = matcher.find_all("ａｂｃdefghiｊ")
+    assert hits == {"abcdefghij": [(0, 10)], "hij": [(7, 10)], "j": [(9, 10)]}
+
+
+def test_suffix_keywords_counted_per_occurrence():
+    matcher = KeywordMatcher(["시간", "72시간", "24시간"])
+    hits = matcher.find_all("72시간 이내, 24 시간 이내")
+    assert hits["시간"] == [(2, 4), (12, 14)]
+    assert hits["72시간"] == [(0, 4)]
+    assert hits["24시간"] == [(9, 14)]
+
+
+def test_rule_pack_hit_counts():
+    hits = get_ruleset().matcher.find_all("72시간 이내")
+    assert hits["시간"] == [(2, 4)]
@@ -0,0 +1,209 @@
+"""
+업로드 파일 받기
+파싱 전에 크기/쪽수 제한을 확인하고, 파서에는 복사본 대신 업로드 버퍼의 memoryview
+(또는 익명 메모리 맵)를 넘긴다. 요청별 최대 메모리 사용량도 기록한다
+"""
+
+import io
+import logging
+import mmap
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import PyPDF2
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# 업로드 상한 (이보다 크면 읽기 전에 거절)
+MAX_UPLOAD_BYTES = int(os.environ.get("CONGA_MAX_UPLOAD_MB", "20")) * 1024 * 1024
+MAX_PDF_PAGES = int(os.environ.get("CONGA_MAX_PDF_PAGES", "500"))
+
+# 설정하면 요청마다 tracemalloc으로 파이썬 객체 최대 사용량도 잼 (할당이 느려지므로 측정할 때만)
+TRACE_MEMORY = os.environ.get("CONGA_TRACE_MEMORY") == "1"
+
+PDF_TYPES = ("application/pdf",)
+IMAGE_TYPES = ("image/jpeg", "image/png")
+
+_READ_BLOCK = 1024 * 1024
+
+
+class UploadRejected(ValueError):
+    """크기/쪽수/형식 제한에 걸린 업로드 (사용자에게 그대로 보여줄 문구)"""
+
+
+class BufferReader(io.RawIOBase):
+    """memoryview를 복사하지 않고 읽는 파일 객체 (PyPDF2 / Pillow에 넘김)
+
+    read()는 요청한 구간만 bytes로 만들어 돌려준다.
+    """
+
+    def __init__(self, buffer):
+        self._buffer = memoryview(buffer).cast("B")
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, target):
+        chunk = self._buffer[self._pos:self._pos + len(target)]
+        target[:len(chunk)] = chunk
+        self._pos += len(chunk)
+        return len(chunk)
+
+    def read(self, size=-1):
+        end = len(self._buffer) if size is None or size < 0 else min(self._pos + size, len(self._buffer))
+        data = self._buffer[self._pos:end].tobytes()
+        self._pos = end
+        return data
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._buffer)
+        self._pos = max(0, offset)
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def close(self):
+        # 원래 버퍼를 놓아 줘야 업로드 버퍼도 해제할 수 있음
+        if not self.closed:
+            self._buffer.release()
+        super().close()
+
+
+class Upload:
+    """제한을 통과한 업로드 (내용은 buffer로만 접근)"""
+
+    __slots__ = ("name", "kind", "size", "pages", "buffer", "_mapping")
+
+    def __init__(self, name, kind, buffer, pages=None, mapping=None):
+        self.name = name
+        self.kind = kind            # "pdf" / "image"
+        self.size = len(buffer)
+        self.pages = pages
+        self.buffer = buffer
+        self._mapping = mapping
+
+    def open(self):
+        """내용을 읽는 파일 객체 (다 쓰면 close() - with 문 사용)"""
+        return BufferReader(self.buffer)
+
+    def release(self):
+        """버퍼 해제 (분석이 끝나면 바로 호출)"""
+        buffer, self.buffer = self.buffer, None
+        mapping, self._mapping = self._mapping, None
+        try:
+            if buffer is not None:
+                buffer.release()
+            if mapping is not None:
+                mapping.close()
+        except BufferError:
+            # 파서가 아직 참조하고 있으면 참조가 사라질 때 해제됨
+            pass
+
+
+def _upload_size(file):
+    size = getattr(file, "size", None)
+    if size is not None:
+        return size
+    position = file.tell()
+    size = file.seek(0, io.SEEK_END)
+    file.seek(position)
+    return size
+
+
+def _buffer_of(file, size):
+    """업로드 내용의 memoryview (BytesIO류는 내부 버퍼 그대로, 그 밖에는 익명 메모리 맵에 한 번만 읽음)"""
+    if isinstance(file, io.BytesIO):
+        return file.getbuffer(), None
+    mapping = mmap.mmap(-1, max(size, 1))
+    file.seek(0)
+    view = memoryview(mapping)
+    filled = 0
+    while filled < size:
+        read = file.readinto(view[filled:min(filled + _READ_BLOCK, size)])
+        if not read:
+            break
+        filled += read
+    return view[:filled], mapping
+
+
+def ingest(file, max_bytes=MAX_UPLOAD_BYTES, max_pages=MAX_PDF_PAGES):
+    """업로드 파일 확인 후 Upload 반환 (제한에 걸리면 UploadRejected)
+
+    크기는 내용을 읽기 전에, PDF 쪽수는 텍스트를 뽑기 전에 (쪽 목록만 읽어서) 확인한다.
+    """
+    size = _upload_size(file)
+    if size > max_bytes:
+        raise UploadRejected(f"파일이 너무 큽니다 ({size / 1024 / 1024:.1f}MB, 최대 {max_bytes // 1024 // 1024}MB)")
+
+    content_type = getattr(file, "type", None)
+    if content_type in PDF_TYPES:
+        kind = "pdf"
+    elif content_type in IMAGE_TYPES:
+        kind = "image"
+    else:
+        raise UploadRejected(f"지원하지 않는 파일 형식입니다 ({content_type})")
+
+    buffer, mapping = _buffer_of(file, size)
+    upload = Upload(getattr(file, "name", ""), kind, buffer, mapping=mapping)
+
+    if kind == "pdf":
+        try:
+            with upload.open() as stream:
+                upload.pages = len(PyPDF2.PdfReader(stream).pages)
+        except Exception:
+            upload.release()
+            raise UploadRejected("PDF 파일을 열 수 없습니다")
+        if upload.pages > max_pages:
+            upload.release()
+            raise UploadRejected(f"쪽수가 너무 많습니다 ({upload.pages}쪽, 최대 {max_pages}쪽)")
+    return upload
+
+
+def _rss_peak():
+    """프로세스 최대 RSS (바이트, 잴 수 없으면 0)"""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+@contextmanager
+def track_memory(label):
+    """요청 하나의 메모리 사용량을 재서 기록하고, 결과를 dict로 돌려줌
+
+    rss_growth: 요청 동안 늘어난 프로세스 최대 RSS (이미 더 큰 요청이 있었으면 0)
+    python_peak: tracemalloc으로 잰 파이썬 객체 최대 사용량 (TRACE_MEMORY일 때만, 동시 요청은 합산됨)
+    """
+    report = {"label": label}
+    tracing = TRACE_MEMORY and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    elif tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+    rss_before = _rss_peak()
+    start = time.perf_counter()
+    try:
+        yield report
+    finally:
+        report["seconds"] = round(time.perf_counter() - start, 3)
+        report["rss_peak"] = _rss_peak()
+        report["rss_growth"] = report["rss_peak"] - rss_before
+        report["python_peak"] = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None
+        if tracing:
+            tracemalloc.stop()
+        logger.info("memory %s", report)